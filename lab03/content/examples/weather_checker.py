@@ -1,17 +1,28 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+WEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather"
+TIMEOUT = (3.05, 5)  # Seconds to connect, seconds to wait for the answer
+
+# One Session keeps the connection open between lookups instead of opening
+# a new one each time, and retries "too many requests" (429) and server
+# errors (5xx) a few times, waiting a little longer before each retry
+session = requests.Session()
+session.mount("http://", HTTPAdapter(max_retries=Retry(
+    total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])))
 
 def get_weather(city, api_key):
     """Get weather data for a specific city"""
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-    
+    params = {"q": city, "appid": api_key, "units": "metric"}
     try:
-        response = requests.get(url)
+        response = session.get(WEATHER_API_URL, params=params, timeout=TIMEOUT)
         if response.status_code == 200:
             return response.json()
         else:
             return None
-    except requests.RequestException:
+    except (requests.RequestException, ValueError):
         return None
 
 def main():
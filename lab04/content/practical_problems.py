@@ -10,6 +10,10 @@ Instructions:
 - Use appropriate data structures and control flow
 """
 
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+
 def problem_1_text_analyzer(text):
     """
     Problem 1: Text Analyzer
@@ -259,7 +263,84 @@ def problem_9_simple_calculator(expression_list):
     pass
 
 
-def problem_10_data_validator(data_list, validation_rules):
+def _compile_validation_rules(validation_rules):
+    """Prepare rules once: compile regexes and resolve type names."""
+    field_types = {}
+    for field, expected in validation_rules.get('field_types', {}).items():
+        if isinstance(expected, str):
+            expected = {'str': str, 'int': int, 'float': float, 'bool': bool,
+                        'list': list, 'dict': dict}[expected]
+        field_types[field] = expected
+    return {
+        'required_fields': list(validation_rules.get('required_fields', [])),
+        'field_types': field_types,
+        'field_ranges': dict(validation_rules.get('field_ranges', {})),
+        'field_patterns': {field: re.compile(pattern)
+                           for field, pattern in validation_rules.get('field_patterns', {}).items()},
+    }
+
+
+def _validate_record(record, rules):
+    """Return a list of error messages for one record (empty if valid)."""
+    errors = []
+    for field in rules['required_fields']:
+        if field not in record or record[field] in (None, ''):
+            errors.append(f"Missing required field: {field}")
+
+    for field, expected in rules['field_types'].items():
+        if field in record and record[field] is not None and not isinstance(record[field], expected):
+            errors.append(f"Field '{field}' has wrong type: {type(record[field]).__name__}")
+
+    for field, limits in rules['field_ranges'].items():
+        value = record.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if 'min' in limits and value < limits['min']:
+                errors.append(f"Field '{field}' below minimum {limits['min']}")
+            if 'max' in limits and value > limits['max']:
+                errors.append(f"Field '{field}' above maximum {limits['max']}")
+
+    for field, pattern in rules['field_patterns'].items():
+        value = record.get(field)
+        if isinstance(value, str) and not pattern.match(value):
+            errors.append(f"Field '{field}' does not match pattern")
+    return errors
+
+
+def _validate_shard(records, start_index, rules, max_invalid_examples):
+    """Validate a slice of the data; indexes in the result are global."""
+    valid_records = []
+    invalid_records = []
+    invalid_count = 0
+    error_counts = {}
+    for offset, record in enumerate(records):
+        errors = _validate_record(record, rules)
+        if not errors:
+            valid_records.append(record)
+            continue
+        invalid_count += 1
+        for error in errors:
+            error_counts[error] = error_counts.get(error, 0) + 1
+        if max_invalid_examples is None or len(invalid_records) < max_invalid_examples:
+            invalid_records.append({'index': start_index + offset, 'record': record,
+                                    'errors': errors})
+    return valid_records, invalid_records, invalid_count, error_counts
+
+
+# Each worker process keeps its own compiled copy of the rules
+_worker_rules = None
+
+
+def _init_validator_worker(validation_rules):
+    global _worker_rules
+    _worker_rules = _compile_validation_rules(validation_rules)
+
+
+def _validate_shard_in_worker(shard):
+    records, start_index, max_invalid_examples = shard
+    return _validate_shard(records, start_index, _worker_rules, max_invalid_examples)
+
+
+def problem_10_data_validator(data_list, validation_rules, workers=1, max_invalid_examples=None):
     """
     Problem 10: Data Validator
     
@@ -272,6 +353,10 @@ def problem_10_data_validator(data_list, validation_rules):
             - 'field_types': dict mapping field names to expected types
             - 'field_ranges': dict with min/max values for numeric fields
             - 'field_patterns': dict with regex patterns for string fields (simplified)
+        workers (int): Number of processes to split the records across
+                       (1 = validate in this process)
+        max_invalid_examples (int): Keep at most this many invalid records
+                                    in the result (None = keep all)
     
     Returns:
         dict: Validation results containing:
@@ -279,12 +364,54 @@ def problem_10_data_validator(data_list, validation_rules):
             - 'invalid_records': list of invalid records with error details
             - 'summary': dict with counts and error statistics
     
+    Results are the same, in the same order, for any number of workers.
+    
     Example:
         Validate student records for required name, age, and email fields
         with appropriate types and value ranges
+        
+        rules = {
+            'required_fields': ['name', 'age', 'email'],
+            'field_types': {'name': str, 'age': int},
+            'field_ranges': {'age': {'min': 0, 'max': 120}},
+            'field_patterns': {'email': r'^[^@]+@[^@]+\.[a-z]+$'}
+        }
     """
-    # TODO: Implement this function
-    pass
+    if workers <= 1 or len(data_list) < 2 * workers:
+        rules = _compile_validation_rules(validation_rules)
+        shards = [_validate_shard(data_list, 0, rules, max_invalid_examples)]
+    else:
+        shard_size = -(-len(data_list) // workers)  # Round up
+        tasks = [(data_list[start:start + shard_size], start, max_invalid_examples)
+                 for start in range(0, len(data_list), shard_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_validator_worker,
+                                 initargs=(validation_rules,)) as pool:
+            shards = list(pool.map(_validate_shard_in_worker, tasks))
+
+    # Merge shard results in input order
+    valid_records = []
+    invalid_records = []
+    invalid_count = 0
+    error_counts = {}
+    for shard_valid, shard_invalid, shard_invalid_count, shard_errors in shards:
+        valid_records.extend(shard_valid)
+        invalid_records.extend(shard_invalid)
+        invalid_count += shard_invalid_count
+        for error, count in shard_errors.items():
+            error_counts[error] = error_counts.get(error, 0) + count
+    if max_invalid_examples is not None:
+        invalid_records = invalid_records[:max_invalid_examples]
+
+    return {
+        'valid_records': valid_records,
+        'invalid_records': invalid_records,
+        'summary': {
+            'total_records': len(data_list),
+            'valid_count': len(valid_records),
+            'invalid_count': invalid_count,
+            'error_counts': error_counts,
+        },
+    }
 
 
 # Test cases for each problem
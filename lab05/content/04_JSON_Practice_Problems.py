@@ -25,9 +25,42 @@ Problem difficulty progression:
 - Problems 1-3: Reinforce Modules 1-2 concepts
 - Problems 4-7: Extend Module 3 concepts
 - Problems 8-10: Challenge problems with new techniques
+
+Helper modules:
+The longer solutions build on helper modules in this folder. Solve a
+problem yourself first, then read the module it uses:
+- json_codec.py       fast JSON loading and saving (most problems)
+- course_index.py     prerequisite chains in a course catalog (Problem 2)
+- gpa_stats.py        one-pass statistics with percentiles (Problem 3)
+- inventory_store.py  journal and compact storage for inventories (Problem 4)
+- layered_config.py   config layers, validation rules, hot reload (Problem 5)
+- record_files.py     streaming, merging and patching record files (Problem 6)
+- json_paths.py       compiled paths and column extraction (Problem 7)
+- record_search.py    search operators, field indexes, query planner (Problem 8)
+- csv_convert.py      chunked, parallel CSV to JSON conversion (Problem 9)
+- schema_compiler.py  validating many records quickly (Problem 10)
 """
 
+import io
+import itertools
 import json
+import math
+import os
+import re
+import tempfile
+import time
+import warnings
+from collections.abc import Mapping
+
+import csv_convert  # Chunked CSV to JSON conversion (see csv_convert.py)
+import gpa_stats  # One-pass GPA statistics (see gpa_stats.py)
+import inventory_store  # Journal and compact product storage (see inventory_store.py)
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+import json_paths  # Compiled JSON paths (see json_paths.py)
+import layered_config  # Config layers, rules and hot reload (see layered_config.py)
+import record_files  # Streaming, merging and patching record files (see record_files.py)
+import record_search  # Search operators and field indexes (see record_search.py)
+import schema_compiler  # Fast validation of many records (see schema_compiler.py)
 
 
 # ==============================================================================
@@ -84,21 +117,23 @@ def build_course_catalog(courses_list):
         ... ]
         >>> catalog = build_course_catalog(courses)
     """
-    # TODO: Build a dictionary with structure:
-    # {
-    #   "courses": [
-    #     {"code": "...", "title": "...", "credits": ..., "prerequisites": [...]},
-    #     ...
-    #   ]
-    # }
-    # Return as JSON string with indent=2
-    pass
+    catalog = {
+        "courses": [
+            {"code": code, "title": title, "credits": credits, "prerequisites": list(prerequisites)}
+            for code, title, credits, prerequisites in courses_list
+        ]
+    }
+    return json.dumps(catalog, indent=2)
+
+
+# For "what do I need before COMP3100?" on a catalog like this one, see
+# course_index.PrerequisiteIndex.
 
 
 # ==============================================================================
 # PROBLEM 3: Student GPA Calculator
 # ==============================================================================
-def calculate_student_gpas(json_file_path):
+def calculate_student_gpas(json_file_path, cache=False):
     """
     Read student records from a JSON file and calculate average GPA.
 
@@ -113,25 +148,135 @@ def calculate_student_gpas(json_file_path):
 
     Args:
         json_file_path (str): Path to the JSON file
+        cache (bool): Load through json_codec's document cache (faster when
+                      the same file is read again, but it stays in memory)
 
     Returns:
         dict: {
             "total_students": int,
             "average_gpa": float (rounded to 2 decimals),
             "highest_gpa": float,
-            "lowest_gpa": float
+            "lowest_gpa": float,
+            "stddev_gpa": float,
+            "median_gpa": float,
+            "p90_gpa": float,
+            "p99_gpa": float,
+            "gpa_histogram": {"0.0-0.5": int, ..., "3.5-4.0": int}
         }
 
-    Returns None if file not found or invalid JSON.
+    Returns None if file not found, invalid JSON, or not a JSON object.
     """
-    # TODO: Implement with proper error handling
-    pass
+    load = json_codec.load_cached if cache else json_codec.load_path
+    try:
+        data = load(json_file_path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, Mapping):  # Also accepts the cache's ReadOnlyDict
+        return None
+
+    stats = gpa_stats.GpaStats()
+    stats.update(student["gpa"] for student in data.get("students", [])
+                 if isinstance(student, Mapping) and "gpa" in student)
+    return stats.summary()
+
+
+def calculate_student_gpas_many(json_file_paths, workers=None):
+    """
+    Calculate GPA statistics across many student files.
+
+    Each file is streamed (never fully loaded) in its own process, and the
+    partial results are merged, so the answer is the same as for one file
+    holding every student.
+
+    Args:
+        json_file_paths (list): Paths to student JSON files
+        workers (int): Number of processes (None = all cores, 1 = no pool)
+
+    Returns:
+        dict: Same keys as calculate_student_gpas(), plus "skipped_files"
+              listing files that were missing or invalid JSON
+
+    Example:
+        >>> result = calculate_student_gpas_many(["fall.json", "spring.json"])
+        >>> print(result["median_gpa"], result["skipped_files"])
+    """
+    workers = workers or os.cpu_count() or 1
+    json_file_paths = list(json_file_paths)
+    total = gpa_stats.GpaStats()
+    skipped = []
+    results = record_files.map_in_order(gpa_stats.stats_for_file, json_file_paths, workers)
+    for path, stats in zip(json_file_paths, results):
+        if stats is None:
+            skipped.append(path)
+        else:
+            total.merge(stats)
+    summary = total.summary()
+    summary["skipped_files"] = skipped
+    return summary
 
 
 # ==============================================================================
 # PROBLEM 4: Inventory Manager with Persistence (Functional Approach)
 # ==============================================================================
-def load_inventory(filename):
+# Big inventories: with journal=True, add_product and update_quantity append
+# each change to "<filename>.journal" instead of rewriting the whole file,
+# and compact=True keeps the products in typed arrays instead of a dict of
+# dicts (see inventory_store.py for both).
+
+def benchmark_inventory_stores(product_count=200000, update_count=200000):
+    """
+    Compare the dict-of-dicts inventory with CompactProductStore.
+
+    Prints memory used by the products, the time to add them, to apply
+    random quantity updates, and to compute the total value.
+
+    Args:
+        product_count (int): Number of products to create
+        update_count (int): Number of update_quantity calls to time
+
+    Returns:
+        dict: {"dict": {...}, "compact": {...}} with the measurements
+    """
+    import random
+    import tracemalloc
+
+    ids = [f"P{i:07d}" for i in range(product_count)]
+    names = [f"Product {i % 1000}" for i in range(product_count)]
+    updates = [(random.choice(ids), random.randint(-5, 5)) for _ in range(update_count)]
+    results = {}
+
+    for label, make_products in (("dict", dict), ("compact", inventory_store.CompactProductStore)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        inventory = inventory_store.Inventory(products=make_products())
+        for i, product_id in enumerate(ids):
+            add_product(inventory, product_id, names[i], 100, 9.99)
+        add_seconds = time.perf_counter() - start
+        memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for product_id, change in updates:
+            update_quantity(inventory, product_id, change)
+        update_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        calculate_total_value(inventory)
+        total_seconds = time.perf_counter() - start
+
+        results[label] = {"memory_mb": memory_mb, "add_per_sec": product_count / add_seconds,
+                          "update_per_sec": update_count / update_seconds,
+                          "total_value_ms": total_seconds * 1000}
+
+    print(f"{'store':8} {'memory MB':>10} {'adds/s':>12} {'updates/s':>12} {'total ms':>10}")
+    for label, r in results.items():
+        print(f"{label:8} {r['memory_mb']:10.1f} {r['add_per_sec']:12,.0f} "
+              f"{r['update_per_sec']:12,.0f} {r['total_value_ms']:10.2f}")
+    return results
+
+
+def load_inventory(filename, journal=False, fsync_policy="interval", compact_every=10000,
+                   compact=False):
     """
     Load inventory from JSON file. Create new if doesn't exist.
 
@@ -144,21 +289,53 @@ def load_inventory(filename):
       }
     }
 
+    Any changes recorded in "<filename>.journal" are replayed on top of the
+    file, so the result always reflects the latest add/update.
+
     Args:
         filename (str): Path to JSON inventory file
+        journal (bool): If True, later add_product/update_quantity calls
+                        append to the journal instead of needing a full save
+        fsync_policy (str): "always" (fsync every change, safest),
+                            "interval" (at most once per second) or
+                            "never" (leave flushing to the OS, fastest)
+        compact_every (int): Fold the journal into the snapshot after this
+                             many changes (None = only on save_inventory)
+        compact (bool): Keep products in a CompactProductStore (much less
+                        memory per product) instead of a dict of dicts
 
     Returns:
-        dict: Inventory dictionary with "products" key
+        dict: Inventory dictionary with "products" key (an
+              inventory_store.Inventory, which also carries the journal)
     """
-    # TODO: Try to load from file, create new structure if file doesn't exist
-    # Hint: Use try/except for FileNotFoundError and json.JSONDecodeError
-    pass
+    try:
+        # Big inventories load from a binary snapshot (see json_codec.load_path)
+        inventory = inventory_store.Inventory(json_codec.load_path(filename))
+    except (FileNotFoundError, json.JSONDecodeError):
+        inventory = inventory_store.Inventory(products={})
+
+    inventory.setdefault("products", {})
+    if compact:
+        inventory["products"] = inventory_store.CompactProductStore(inventory["products"])
+    snapshot_seq = inventory.pop("journal_seq", 0)
+    seq, valid_size = inventory_store.replay_journal(inventory["products"],
+                                                     filename + ".journal", snapshot_seq)
+
+    if journal:
+        inventory.journal = inventory_store.InventoryJournal(filename, seq, valid_size,
+                                                             fsync_policy, compact_every)
+    return inventory
 
 
 def save_inventory(inventory, filename):
     """
     Save inventory dictionary to JSON file.
 
+    For a journaled inventory this compacts the journal into the file.
+    Otherwise the file is rewritten in full and any journal left next to it
+    is retired, since its changes are already part of the saved products.
+    The file is replaced atomically, so a crash never leaves it half written.
+
     Args:
         inventory (dict): Inventory dictionary to save
         filename (str): Path to save JSON file
@@ -166,9 +343,57 @@ def save_inventory(inventory, filename):
     Returns:
         bool: True if successful, False if error occurred
     """
-    # TODO: Save with proper error handling
-    # Hint: Use try/except for IOError
-    pass
+    journal = getattr(inventory, "journal", None)
+    try:
+        if journal is not None and journal.filename == filename:
+            journal.compact(inventory)
+            return True
+
+        data = dict(inventory)
+        journal_path = filename + ".journal"
+        last_seq = inventory_store.last_journal_seq(journal_path)
+        if last_seq:
+            # Skip these entries on load even if we crash before removing them
+            data["journal_seq"] = last_seq
+        with open(filename + ".tmp", 'wb') as f:
+            json_codec.dump(data, f, indent=2, default=inventory_store.json_default)
+        os.replace(filename + ".tmp", filename)
+        if last_seq:
+            os.remove(journal_path)
+        return True
+    except (IOError, TypeError):
+        return False
+
+
+def close_inventory(inventory):
+    """Flush and close the journal of an inventory opened with journal=True."""
+    journal = getattr(inventory, "journal", None)
+    if journal is not None:
+        inventory.journal = None
+        journal.close()
+
+
+def _journal_change(inventory, *mutation):
+    """Write-ahead: log the change (if journaling) before it is applied."""
+    journal = getattr(inventory, "journal", None)
+    if journal is not None:
+        journal.record(*mutation)
+    return journal
+
+
+# ------------------------------------------------------------------------------
+# Running total: calculate_total_value is called far more often than the
+# inventory changes, so the sum of price × quantity is kept up to date by
+# add_product and update_quantity instead of being recomputed every time.
+# ------------------------------------------------------------------------------
+TOTAL_AUDIT_EVERY = 0  # Recompute and cross-check every N reads (0 = never)
+
+
+def _track_total(inventory, amount):
+    """Add amount to the running total if the inventory has one."""
+    total = getattr(inventory, "total", None)
+    if total is not None:
+        total.add(amount)
 
 
 def add_product(inventory, product_id, name, quantity, price):
@@ -181,9 +406,26 @@ def add_product(inventory, product_id, name, quantity, price):
         name (str): Product name
         quantity (int): Product quantity
         price (float): Product price
+
+    Raises:
+        TypeError: If name is not a string, quantity is not a whole number
+                   or price is not a number (nothing is changed or journaled)
+        OverflowError: If the inventory uses a CompactProductStore and
+                       quantity does not fit in 64 bits
     """
-    # TODO: Add/update product in inventory['products']
-    pass
+    products = inventory['products']
+    # Check before journaling, so a rejected product never reaches the log
+    product = inventory_store.check_product(
+        products, {"name": name, "quantity": quantity, "price": price})
+    quantity, price = product["quantity"], product["price"]
+    journal = _journal_change(inventory, "add", product_id, name, quantity, price)
+    old_product = products.get(product_id)
+    if old_product is not None:
+        _track_total(inventory, -old_product['price'] * old_product['quantity'])
+    products[product_id] = {"name": name, "quantity": quantity, "price": price}
+    _track_total(inventory, price * quantity)
+    if journal is not None and journal.needs_compaction():
+        journal.compact(inventory)
 
 
 def update_quantity(inventory, product_id, quantity_change):
@@ -197,9 +439,25 @@ def update_quantity(inventory, product_id, quantity_change):
 
     Returns:
         bool: True if successful, False if product doesn't exist
+
+    Raises:
+        TypeError: If quantity_change is not a whole number (nothing is
+                   changed or journaled)
+        OverflowError: If the inventory uses a CompactProductStore and the
+                       new quantity does not fit in 64 bits
     """
-    # TODO: Check if product exists, update quantity, return True/False
-    pass
+    products = inventory['products']
+    if product_id not in products:
+        return False
+    # Check before journaling, so a rejected change never reaches the log
+    inventory_store.check_quantity_change(products, product_id, quantity_change)
+    journal = _journal_change(inventory, "qty", product_id, quantity_change)
+    inventory_store.change_quantity(products, product_id, quantity_change)
+    if getattr(inventory, "total", None) is not None:
+        _track_total(inventory, products[product_id]['price'] * quantity_change)
+    if journal is not None and journal.needs_compaction():
+        journal.compact(inventory)
+    return True
 
 
 def get_product(inventory, product_id):
@@ -213,27 +471,89 @@ def get_product(inventory, product_id):
     Returns:
         dict: Product info dict, or None if not found
     """
-    # TODO: Return product or None
-    pass
+    return inventory['products'].get(product_id)
 
 
-def calculate_total_value(inventory):
+def calculate_total_value(inventory, audit=False):
     """
     Calculate total value of all inventory (price × quantity for all products).
 
+    The first call sums every product; after that the total is kept up to
+    date by add_product and update_quantity, so each call is O(1). Changes
+    made to inventory['products'] directly are not tracked, so the total is
+    audited (fully recomputed and compared) when audit=True or every
+    TOTAL_AUDIT_EVERY calls; a drift is reported with warnings.warn. A
+    plain dict (not from load_inventory) is summed in full on every call.
+
     Args:
         inventory (dict): Inventory dictionary
+        audit (bool): Recompute from scratch and fix the running total if
+                      it has drifted
 
     Returns:
         float: Total inventory value
     """
-    # TODO: Calculate sum of (price * quantity) for all products
-    pass
+    if not isinstance(inventory, inventory_store.Inventory):
+        return inventory_store.recompute_total(inventory['products'])
+    total = inventory.total
+    if total is None:
+        exact = inventory_store.recompute_total(inventory['products'])
+        total = inventory.total = inventory_store.RunningTotal(exact)
+        return total.value
+
+    total.reads += 1
+    if audit or (TOTAL_AUDIT_EVERY and total.reads % TOTAL_AUDIT_EVERY == 0):
+        exact = inventory_store.recompute_total(inventory['products'])
+        if not math.isclose(total.value, exact, rel_tol=1e-9, abs_tol=1e-6):
+            warnings.warn(f"Running total drifted: {total.value} vs {exact}, resetting",
+                          RuntimeWarning, stacklevel=2)
+        total.sum, total.compensation = exact, 0.0
+    return total.value
 
 
 # ==============================================================================
 # PROBLEM 5: Configuration File Validator
 # ==============================================================================
+# The checks are a table of (path, check) rules. Each check looks at the
+# value at one path and returns a list of error messages, so a config
+# watcher (layered_config.ConfigWatcher) can re-run just the rules whose part of the
+# document changed.
+
+def _expect_type(expected, type_name):
+    def check(path_name, value):
+        if isinstance(value, bool) and expected is not bool:
+            return [f"Field '{path_name}' must be {type_name}"]
+        if not isinstance(value, expected):
+            return [f"Field '{path_name}' must be {type_name}"]
+        return []
+    return check
+
+
+def _check_version(path_name, value):
+    if not isinstance(value, str):
+        return [f"Field '{path_name}' must be a string"]
+    if not re.fullmatch(r"\d+\.\d+", value):
+        return [f"Field '{path_name}' must look like X.Y (got {value!r})"]
+    return []
+
+
+def _check_port(path_name, value):
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 65535:
+        return [f"Field '{path_name}' must be an integer between 1 and 65535"]
+    return []
+
+
+CONFIG_RULES = [
+    (("app_name",), _expect_type(str, "a string")),
+    (("version",), _check_version),
+    (("debug",), _expect_type(bool, "a boolean")),
+    (("database",), _expect_type(Mapping, "an object")),
+    (("database", "host"), _expect_type(str, "a string")),
+    (("database", "port"), _check_port),
+    (("database", "name"), _expect_type(str, "a string")),
+]
+
+
 def validate_config(json_string):
     """
     Validate a configuration JSON string against required schema.
@@ -261,16 +581,15 @@ def validate_config(json_string):
         ...     for error in errors:
         ...         print(f"  - {error}")
     """
-    errors = []
-
-    # TODO: Implement validation logic
-    # 1. Try to parse JSON (catch JSONDecodeError)
-    # 2. Check all required fields exist
-    # 3. Validate data types
-    # 4. Validate ranges (port number)
-    # 5. Validate version format (regex or split by '.')
+    try:
+        config = json.loads(json_string)
+    except json.JSONDecodeError as e:
+        return False, [f"Invalid JSON: {e}"]
+    if not isinstance(config, dict):
+        return False, ["Configuration must be a JSON object"]
 
-    pass
+    errors = layered_config.check_config(config, CONFIG_RULES)
+    return not errors, errors
 
 
 # ==============================================================================
@@ -284,6 +603,8 @@ def merge_json_files(file1_path, file2_path, output_path):
     Records are merged by "id" field. If same ID appears in both files,
     file2's record takes precedence.
 
+    Uses record_files.merge_json_files_many, so neither file has to fit in memory.
+
     Args:
         file1_path (str): Path to first JSON file
         file2_path (str): Path to second JSON file
@@ -297,8 +618,10 @@ def merge_json_files(file1_path, file2_path, output_path):
         file2: {"records": [{"id": 2, "name": "B-updated"}, {"id": 3, "name": "C"}]}
         output: {"records": [{"id": 1, "name": "A"}, {"id": 2, "name": "B-updated"}, {"id": 3, "name": "C"}]}
     """
-    # TODO: Implement with proper error handling
-    pass
+    try:
+        return record_files.merge_json_files_many([file1_path, file2_path], output_path)
+    except (OSError, ValueError):
+        return -1
 
 
 # ==============================================================================
@@ -309,8 +632,11 @@ def extract_nested_field(data, field_path):
     Extract a value from nested JSON using a dot-separated path.
 
     Args:
-        data (dict): Python dictionary (parsed JSON)
-        field_path (str): Dot-separated path (e.g., "user.address.city")
+        data (dict): Python dictionary (parsed JSON, or a read-only view
+                     from json_codec.load_cached)
+        field_path (str): Dot-separated path (e.g., "user.address.city").
+                          Also accepts list indexes ("weather[0].main") and
+                          wildcards ("movies[*].title", returns a list)
 
     Returns:
         The value at the path, or None if path doesn't exist
@@ -322,10 +648,25 @@ def extract_nested_field(data, field_path):
         >>> extract_nested_field(data, "user.address.country")
         None
     """
-    # TODO: Implement
-    # Hint: Split the path by '.' and navigate step by step
-    # Use .get() to safely access keys
-    pass
+    return json_paths.compile_json_path(field_path).get(data)
+
+
+def extract_nested_field_many(documents, field_path):
+    """
+    Extract the same path from many documents, parsing the path only once.
+
+    Args:
+        documents: Iterable of parsed JSON documents
+        field_path (str): Path, same syntax as extract_nested_field
+
+    Returns:
+        list: One result per document (None where the path doesn't exist)
+
+    Example:
+        >>> extract_nested_field_many(
+        ...     record_files.iter_records("courses.json"), "instructor.name")
+    """
+    return json_paths.compile_json_path(field_path).get_many(documents)
 
 
 # ==============================================================================
@@ -342,6 +683,9 @@ def search_records(json_file_path, **search_criteria):
         json_file_path (str): Path to JSON file
         **search_criteria: Keyword arguments for search
                           (e.g., name="Alice", age=25)
+                          Add __gt, __gte, __lt, __lte, __between, __in,
+                          __contains or __ne for other comparisons
+                          (e.g., salary__gt=70000, age__between=(25, 30))
 
     Returns:
         list: Matching records (empty list if none match or error)
@@ -349,12 +693,15 @@ def search_records(json_file_path, **search_criteria):
     Example:
         >>> matches = search_records("students.json", major="CS", gpa=3.8)
         >>> # Returns all records where major=="CS" AND gpa==3.8
+        >>> search_records("records.json", salary__between=(60000, 80000))
+
+    After record_search.build_field_index(json_file_path, "department"),
+    searches on that field read only the matching records.
     """
-    # TODO: Implement
-    # 1. Load JSON file
-    # 2. Filter records matching ALL criteria
-    # 3. Handle errors gracefully
-    pass
+    try:
+        return list(record_search.iter_search_records(json_file_path, **search_criteria))
+    except (OSError, ValueError):
+        return []
 
 
 # ==============================================================================
@@ -390,11 +737,16 @@ def convert_csv_to_json(csv_string, output_file):
             {"name": "Bob", "age": "30", "city": "Boston"}
           ]
         }
+
+    Quoted fields such as "Miami, FL" are handled correctly. For large
+    files use csv_convert.convert_csv_file_to_json, which streams from disk.
     """
-    # TODO: Implement
-    # Hint: Split by newlines, then by commas
-    # First line is headers, rest are data rows
-    pass
+    try:
+        csv_file = io.BytesIO(csv_string.encode('utf-8'))
+        csv_convert.convert_csv_file_to_json(csv_file, output_file, workers=1)
+        return True
+    except (OSError, ValueError, UnicodeError):
+        return False
 
 
 # ==============================================================================
@@ -428,16 +780,94 @@ def validate_json_schema(data, schema):
         ...     "age": {"type": "number", "required": True, "min": 0, "max": 150}
         ... }
         >>> valid, errors = validate_json_schema({"name": "Alice", "age": 25}, schema)
+
+    To validate many records against the same schema, schema_compiler.compile_schema
+    is much faster.
     """
     errors = []
 
-    # TODO: Implement validation logic
-    # 1. Check required fields
-    # 2. Check types
-    # 3. Check ranges for numbers
-    # Return (True, []) if valid, (False, [errors]) if invalid
+    for field, rules in schema.items():
+        # 1. Check required fields
+        if field not in data:
+            if rules.get("required", False):
+                errors.append(f"Missing required field: {field}")
+            continue
 
-    pass
+        value = data[field]
+        type_name = rules.get("type")
+
+        # 2. Check types
+        if type_name is not None:
+            if type_name not in schema_compiler.SCHEMA_TYPES:
+                errors.append(f"Field '{field}' has unknown type '{type_name}' in schema")
+                continue
+            if not schema_compiler.type_matches(value, type_name):
+                errors.append(f"Field '{field}' should be {type_name}, got {type(value).__name__}")
+                continue
+
+        # 3. Check ranges for numbers
+        if type_name == "number":
+            if "min" in rules and value < rules["min"]:
+                errors.append(f"Field '{field}' must be >= {rules['min']}")
+            if "max" in rules and value > rules["max"]:
+                errors.append(f"Field '{field}' must be <= {rules['max']}")
+
+    return len(errors) == 0, errors
+
+
+def benchmark_schema_validation(record_count=200000):
+    """
+    Time validate_json_schema against a compiled schema on the same records.
+
+    Args:
+        record_count (int): Number of generated records (about 10% invalid)
+
+    Returns:
+        dict: Records per second for "interpreted", "compiled" and
+              "validate_many"
+    """
+    import random
+
+    schema = {
+        "id": {"type": "number", "required": True, "min": 1},
+        "name": {"type": "string", "required": True},
+        "age": {"type": "number", "required": True, "min": 0, "max": 150},
+        "gpa": {"type": "number", "required": False, "min": 0.0, "max": 4.0},
+        "active": {"type": "boolean", "required": True},
+        "courses": {"type": "array", "required": False},
+    }
+    records = []
+    for i in range(record_count):
+        record = {"id": i + 1, "name": f"Student {i}", "age": random.randint(17, 40),
+                  "gpa": round(random.uniform(0, 4), 2), "active": True,
+                  "courses": ["COMP3083"]}
+        if random.random() < 0.1:
+            record["age"] = random.choice([-1, 200, "old"])
+        records.append(record)
+
+    compiled = schema_compiler.compile_schema(schema)
+    timings = {}
+
+    start = time.perf_counter()
+    for record in records:
+        validate_json_schema(record, schema)
+    timings["interpreted"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in records:
+        compiled(record)
+    timings["compiled"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled.validate_many(records)
+    timings["validate_many"] = time.perf_counter() - start
+
+    results = {}
+    for label, seconds in timings.items():
+        results[label] = record_count / seconds
+        speedup = timings["interpreted"] / seconds
+        print(f"{label:14} {results[label]:12,.0f} records/s  ({speedup:.1f}x)")
+    return results
 
 
 # ==============================================================================
@@ -478,6 +908,16 @@ if __name__ == "__main__":
     # Test Problem 3
     print("\n--- Problem 3: Student GPA Calculator ---")
     print("(Requires test data file - see solution for details)")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "students.json")
+            with open(path, 'w') as f:
+                json.dump([{"name": "Alice", "gpa": 3.8}], f)
+            assert calculate_student_gpas(path) is None
+            assert calculate_student_gpas(path, cache=True) is None
+            print("✓ A file whose top level is not an object returns None")
+    except Exception as e:
+        print(f"Error: {e}")
 
     # Test Problem 4
     print("\n--- Problem 4: Inventory Manager ---")
@@ -504,6 +944,121 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error: {e}")
 
+    # Regression: a plain save after journaled changes must retire the
+    # journal, or every later load applies the same changes again
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            inventory = load_inventory(path, journal=True)
+            add_product(inventory, "P001", "Laptop", 10, 999.99)
+            save_inventory(inventory, path)
+            update_quantity(inventory, "P001", 5)
+            close_inventory(inventory)
+            quantities = []
+            for _ in range(3):
+                inventory = load_inventory(path)
+                quantities.append(inventory["products"]["P001"]["quantity"])
+                save_inventory(inventory, path)
+            assert quantities == [15, 15, 15], quantities
+            print("✓ Journal is replayed exactly once across load/save cycles")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Regression: a rejected product must leave a compact store (and its
+    # journal) exactly as it was
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            inventory = load_inventory(path, journal=True, compact=True)
+            try:
+                add_product(inventory, "P1", "Widget", 2.5, 1.0)
+            except TypeError:
+                pass
+            add_product(inventory, "P2", "Gadget", 3, 2.0)
+            close_inventory(inventory)
+            reloaded = load_inventory(path, compact=True)
+            assert list(reloaded["products"]) == ["P2"], list(reloaded["products"])
+            assert reloaded["products"]["P2"]["quantity"] == 3
+            print("✓ Invalid products are rejected before they reach the store or journal")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Regression: the same goes for a dict store, and a bad journal line
+    # (written by hand or by older code) is skipped instead of breaking load
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            inventory = load_inventory(path, journal=True)
+            add_product(inventory, "P1", "Widget", 2, 1.0)
+            for bad_change in (lambda: update_quantity(inventory, "P1", "3"),
+                               lambda: add_product(inventory, "P2", "Gadget", 1.5, 2.0),
+                               lambda: add_product(inventory, "P3", "Gizmo", 1, "free")):
+                try:
+                    bad_change()
+                    raise AssertionError("an invalid change was accepted")
+                except TypeError:
+                    pass
+            close_inventory(inventory)
+            with open(path + ".journal", 'ab') as f:
+                f.write(b'[5,"qty","P1","3"]\n[6,"add","P4"]\n{"seq":7}\n[8,"qty","P1",1]\n')
+            reloaded = load_inventory(path)
+            assert list(reloaded["products"]) == ["P1"], reloaded
+            assert reloaded["products"]["P1"]["quantity"] == 3, reloaded
+            print("✓ Invalid changes never reach the journal; bad journal lines are skipped")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # The journal and running total stay out of the inventory's keys, and a
+    # drifted total is reported as a warning, not printed
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            inventory = load_inventory(path, journal=True)
+            add_product(inventory, "P1", "Widget", 2, 1.5)
+            assert calculate_total_value(inventory) == 3.0
+            assert list(inventory) == ["products"], list(inventory)
+            inventory["products"]["P1"]["quantity"] = 4  # Not tracked
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                assert calculate_total_value(inventory, audit=True) == 6.0
+            assert [w.category for w in caught] == [RuntimeWarning], caught
+            close_inventory(inventory)
+            print("✓ Running total lives beside the inventory and drift is a warning")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Regression: whatever dumps writes (NaN, Infinity, integers wider than
+    # 64 bits) loads must read back, on every JSON backend
+    original_backend = json_codec.backend_name()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            for backend in json_codec.available_backends():
+                json_codec.set_backend(backend)
+                data = {"nan": math.nan, "inf": math.inf, "ninf": -math.inf,
+                        "big": 2 ** 70, "small": -2 ** 64, "list": [1, 2]}
+                text = json_codec.dumps(data)
+                assert '"list":[1,2]' in text, text
+                for loaded in (json_codec.loads(text), json_codec.loads(text.encode())):
+                    assert math.isnan(loaded["nan"]), (backend, loaded)
+                    assert loaded["inf"] == math.inf and loaded["ninf"] == -math.inf
+                    assert type(loaded["big"]) is int and loaded["big"] == 2 ** 70
+                    assert loaded["small"] == -2 ** 64, (backend, loaded)
+
+                inventory = load_inventory(path)
+                add_product(inventory, "P1", "Widget", 2 ** 70, 1.0)
+                inventory["products"]["P1"]["price"] = math.nan
+                save_inventory(inventory, path)
+                reloaded = load_inventory(path)
+                assert reloaded["products"]["P1"]["quantity"] == 2 ** 70, reloaded
+                os.remove(path)
+            print(f"✓ NaN, Infinity and big integers round-trip on "
+                  f"{', '.join(json_codec.available_backends())}")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        json_codec.set_backend(original_backend)
+
     # Test Problem 5
     print("\n--- Problem 5: Configuration Validator ---")
     test_config = '''
@@ -532,6 +1087,73 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error: {e}")
 
+    # Regression: a rejected reload must not swallow a valid edit to
+    # another file made at the same time
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base_path = os.path.join(temp_dir, "a.json")
+            override_path = os.path.join(temp_dir, "b.json")
+            edits = itertools.count(1)
+
+            def write_config(path, text):
+                with open(path, 'w') as f:
+                    f.write(text)
+                stamp = time.time_ns() + next(edits) * 10**9  # Always a new mtime
+                os.utime(path, ns=(stamp, stamp))
+
+            write_config(base_path, test_config)
+            write_config(override_path, '{"database": {"host": "h2"}}')
+            watcher = layered_config.ConfigWatcher([base_path, override_path], CONFIG_RULES)
+            write_config(override_path, '{"database": {"host": "h3"}}')
+            write_config(base_path, '{"app_name": ')
+            assert not watcher.check()
+            write_config(base_path, test_config)
+            assert watcher.check()
+            assert watcher.config.get("database.host") == "h3", watcher.config.get("database.host")
+            print("✓ Watcher reloads every file changed since a rejected reload")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Test Problem 6
+    print("\n--- Problem 6: JSON Data Merger ---")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_path = os.path.join(temp_dir, "old.json")
+            new_path = os.path.join(temp_dir, "new.json")
+            patch_path = os.path.join(temp_dir, "sync.patch.jsonl")
+            new_records = [{"id": 1, "flags": [1], "score": 2}, {"id": 3, "name": "Cy"}]
+            with open(old_path, 'w') as f:
+                json.dump({"records": [{"id": 1, "flags": [True], "score": 2.0},
+                                       {"id": 2, "name": "Bo"}]}, f)
+            with open(new_path, 'w') as f:
+                json.dump({"records": new_records}, f)
+            # [true] -> [1] and 2.0 -> 2 are equal in Python but not in JSON
+            stats = record_files.diff_record_files(old_path, new_path, patch_path)
+            record_files.apply_record_patch(old_path, patch_path)
+            with open(old_path) as f:
+                patched = json.load(f)["records"]
+            assert json.dumps(patched) == json.dumps(new_records), patched
+            print(f"✓ Patch reproduces the new file exactly ({stats['operations']} operations)")
+
+            # Only the changed records are written: the rest of the file,
+            # including keys after "records", stays byte for byte the same
+            with open(old_path, 'w') as f:
+                json.dump({"records": [{"id": 1, "score": 10}, {"id": 2, "name": "Bo"}],
+                           "meta": {"version": 1}}, f)
+            with open(new_path, 'w') as f:
+                json.dump({"records": [{"id": 1, "score": 9}, {"id": 2, "name": "Bo"}]}, f)
+            record_files.diff_record_files(old_path, new_path, patch_path)
+            with open(old_path, 'rb') as f:
+                before = f.read()
+            assert record_files.apply_record_patch(old_path, patch_path) == 2
+            with open(old_path, 'rb') as f:
+                after = f.read()
+            assert len(after) == len(before) and after.endswith(before[-40:]), after
+            assert json.loads(after)["records"][0] == {"id": 1, "score": 9}
+            print("✓ Patch overwrites only the changed record in place")
+    except Exception as e:
+        print(f"Error: {e}")
+
     # Test Problem 7
     print("\n--- Problem 7: Nested Data Extractor ---")
     try:
@@ -551,6 +1173,99 @@ if __name__ == "__main__":
             print(f"Extracted city: {city}")
         else:
             print("Not implemented yet or not found")
+        assert extract_nested_field(test_data, "") is None
+        assert extract_nested_field(test_data, "user.profile.zip") is None
+        print("✓ Missing and empty paths return None")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Test Problem 8
+    print("\n--- Problem 8: JSON-Based Search Engine ---")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            records_path = os.path.join(temp_dir, "records.json")
+            departments = ["HR", "IT", "Sales"]
+            with open(records_path, 'w') as f:
+                json.dump({"records": [
+                    {"id": i, "department": departments[i % 3], "salary": 50000 + 1000 * i,
+                     "skills": ["python"] if i % 4 == 0 else ["excel"]}
+                    for i in range(60)
+                ]}, f)
+            queries = [
+                {"department": "IT"},
+                {"department": "IT", "salary__gt": 80000},
+                {"department__in": ["HR", "Sales"], "salary__between": (60000, 70000)},
+                {"skills__contains": "python", "department__ne": "HR"},
+            ]
+            scanned = [search_records(records_path, **query) for query in queries]
+            assert scanned[0] and all(r["department"] == "IT" for r in scanned[0])
+            record_search.build_field_index(records_path, "department")
+            indexed = [search_records(records_path, **query) for query in queries]
+            assert indexed == scanned, "index and scan disagree"
+            plan = record_search.explain_search(records_path, department="IT")
+            assert plan["strategy"] == "index", plan
+            print(f"✓ Indexed search matches a full scan ({len(queries)} queries)")
+
+            # The index must not outlive an edit to the data file
+            with open(records_path, 'w') as f:
+                json.dump({"records": [{"id": 99, "department": "IT", "salary": 1}]}, f)
+            assert search_records(records_path, department="IT") == [
+                {"id": 99, "department": "IT", "salary": 1}]
+            print("✓ A stale index is rebuilt after the data file changes")
+
+            # True == 1 == 1.0 in a scan, so the index must agree
+            flags = [True, 1, 1.0, "1", 0, False, [True], [1, "x"], None]
+            with open(records_path, 'w') as f:
+                json.dump({"records": [{"id": i, "flag": flag}
+                                       for i, flag in enumerate(flags)]}, f)
+            queries = [{"flag": 1}, {"flag": True}, {"flag": False}, {"flag": [1]},
+                       {"flag__in": [True, "1"]}, {"flag__gte": 1},
+                       {"flag__contains": True}]
+            scanned = [search_records(records_path, **query) for query in queries]
+            record_search.build_field_index(records_path, "flag")
+            indexed = [search_records(records_path, **query) for query in queries]
+            assert indexed == scanned, "index and scan disagree on bools"
+            assert [r["id"] for r in indexed[1]] == [0, 1, 2]
+            print("✓ Indexed and scanned search agree on True/1/1.0")
+
+            # A string is not a list of choices, with or without the index
+            try:
+                list(record_search.iter_search_records(records_path, flag__in="1"))
+                raise AssertionError("a string __in value was accepted")
+            except ValueError:
+                pass
+            assert search_records(records_path, flag__in="1") == []
+            print("✓ A string __in value is rejected")
+
+            # Other arrays before "records" must not be mistaken for it
+            with open(records_path, 'w') as f:
+                json.dump({"fields": ["id", "name"], "records": [{"id": 1, "name": "a"}]}, f)
+            assert search_records(records_path, name="a") == [{"id": 1, "name": "a"}]
+            record_search.build_field_index(records_path, "name")
+            assert search_records(records_path, name="a") == [{"id": 1, "name": "a"}]
+            merged_path = os.path.join(temp_dir, "merged.json")
+            assert merge_json_files(records_path, records_path, merged_path) == 1
+            print("✓ Search and merge read the \"records\" array, not the first array")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Test Problem 9
+    print("\n--- Problem 9: Data Format Converter ---")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rows = [["zip", "count", "note"]] + [
+                [f"0{2100 + i}", str(i), f'say "hi"\n{i}, "twice"'] for i in range(50)]
+            csv_text = "".join(",".join('"' + field.replace('"', '""') + '"' if '"' in field
+                                        else field for field in row) + "\n" for row in rows)
+            json_path = os.path.join(temp_dir, "out.json")
+            csv_convert.convert_csv_file_to_json(io.BytesIO(csv_text.encode()), json_path,
+                                                 infer_types=True, workers=1, chunk_size=64)
+            with open(json_path) as f:
+                records = json.load(f)["records"]
+            assert len(records) == 50, len(records)
+            assert records[3] == {"zip": "02103", "count": 3,
+                                  "note": 'say "hi"\n3, "twice"'}, records[3]
+            print("✓ Quoted line breaks survive chunking; ZIP codes stay strings")
     except Exception as e:
         print(f"Error: {e}")
 
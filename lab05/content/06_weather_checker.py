@@ -19,17 +19,315 @@ API Used: OpenWeatherMap (https://openweathermap.org/api)
 """
 
 import requests
+import copy
+import hashlib
 import json
 import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+import weather_client  # Pooled connections, timeouts and retries (see weather_client.py)
 
-def get_weather(city, api_key):
+
+# ==============================================================================
+# RESPONSE CACHE
+# ==============================================================================
+# Weather changes slowly, so asking the API about the same city twice within
+# a few minutes wastes a round trip (and API quota). Answers are cached in two
+# tiers, keyed by normalized city name + units + a hash of the API key (so a
+# bad or revoked key gets its own 401, never another key's cached answer):
+#   1. memory: an LRU of the most recent WEATHER_CACHE_SIZE lookups
+#   2. disk:   one small JSON file per lookup in WEATHER_CACHE_DIR, so the
+#              cache survives restarts
+# Entry ages:
+#   younger than ttl               fresh: returned, no request
+#   older, but within max_stale    stale: returned right away, and refreshed
+#                                  in a background thread for next time
+#   older than ttl + max_stale     too old: fetched again before returning
+# "City not found" (404) answers are cached too, for negative_ttl seconds.
+
+WEATHER_CACHE_TTL = 10 * 60        # OpenWeatherMap updates about every 10 minutes
+WEATHER_CACHE_MAX_STALE = 60 * 60  # How long a stale answer may still be shown
+WEATHER_NEGATIVE_TTL = 5 * 60      # How long to remember unknown cities
+WEATHER_CACHE_SIZE = 256           # Entries kept in memory
+WEATHER_CACHE_DIR = ".weather_cache"
+
+
+def normalize_city(city):
+    """'  new   YORK ' -> 'new york' (so spelling variants share a cache entry)."""
+    return " ".join(city.split()).casefold()
+
+
+def weather_cache_key(city, units, api_key):
+    """(city, units, key hash): the key itself is never stored in the cache."""
+    key_hash = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    return normalize_city(city), units, key_hash
+
+
+class WeatherCache:
+    """
+    Two-tier (memory + disk) TTL cache for weather API answers.
+
+    Entries are dicts: {"status": 200 or 404, "data": dict or None,
+    "stored_at": epoch seconds, "fetch_s": seconds the request took}.
+    """
+
+    def __init__(self, ttl=WEATHER_CACHE_TTL, max_stale=WEATHER_CACHE_MAX_STALE,
+                 negative_ttl=WEATHER_NEGATIVE_TTL, max_entries=WEATHER_CACHE_SIZE,
+                 cache_dir=WEATHER_CACHE_DIR):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.memory = OrderedDict()
+        self.refreshing = set()  # Keys with a background refresh running
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0,
+                      "refreshes": 0, "refresh_failures": 0, "saved_s": 0.0}
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + ".json")
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (entry, state) where state is "fresh", "stale" or "miss"
+                   (entry is None for a miss)
+        """
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+        if entry is None and self.cache_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    stored = json_codec.load(f)
+                if stored.get("key") == list(key):
+                    entry = stored["entry"]
+                    self._remember(key, entry)
+            except (OSError, ValueError, KeyError, AttributeError):
+                entry = None  # Missing or unreadable: just a miss
+
+        state = "miss"
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            ttl = self.ttl if entry["status"] == 200 else self.negative_ttl
+            if age < ttl:
+                state = "fresh"
+            elif age < ttl + self.max_stale and entry["status"] == 200:
+                state = "stale"
+        with self.lock:
+            if state == "miss":
+                self.stats["misses"] += 1
+                return None, state
+            if entry["status"] != 200:
+                self.stats["negative_hits"] += 1
+            else:
+                self.stats["hits" if state == "fresh" else "stale_hits"] += 1
+            self.stats["saved_s"] += entry.get("fetch_s", 0.0)
+        return entry, state
+
+    def _remember(self, key, entry):
+        with self.lock:
+            self.memory[key] = entry
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+    def put(self, key, status, data, fetch_s=0.0):
+        """Store an answer (status 200 with data, or 404 with None)."""
+        entry = {"status": status, "data": data, "stored_at": time.time(), "fetch_s": fetch_s}
+        self._remember(key, entry)
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                path = self._disk_path(key)
+                temp_name = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_name, 'wb') as f:
+                    json_codec.dump({"key": list(key), "entry": entry}, f)
+                os.replace(temp_name, path)  # Readers never see half a file
+            except OSError:
+                pass  # The memory tier still works
+        return entry
+
+    def refresh_in_background(self, key, fetch):
+        """Run fetch() in a thread and store its answer (one refresh per key)."""
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def work():
+            try:
+                status, data, fetch_s = fetch()
+                if status in (200, 404):
+                    self.put(key, status, data, fetch_s)
+                    counter = "refreshes"
+                else:
+                    counter = "refresh_failures"
+            except (requests.RequestException, ValueError):
+                counter = "refresh_failures"  # Keep serving the stale answer
+            with self.lock:
+                self.stats[counter] += 1
+                self.refreshing.discard(key)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def clear(self):
+        """Forget everything (memory and disk)."""
+        with self.lock:
+            self.memory.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def report(self):
+        """Hit ratio and time saved, as a printable summary."""
+        with self.lock:
+            stats = dict(self.stats)
+        served = stats["hits"] + stats["stale_hits"] + stats["negative_hits"]
+        lookups = served + stats["misses"]
+        ratio = served / lookups if lookups else 0.0
+        return (f"📦 Cache: {lookups} lookups, hit ratio {ratio:.0%} "
+                f"({stats['hits']} fresh, {stats['stale_hits']} stale, "
+                f"{stats['negative_hits']} not-found), "
+                f"{stats['refreshes']} background refreshes, "
+                f"~{stats['saved_s']:.2f}s of network time saved")
+
+
+weather_cache = WeatherCache()
+weather_flights = weather_client.SingleFlight()  # Coalesces identical in-flight lookups
+
+
+def _fetch_weather(city, api_key, units, limiter=None):
+    """
+    Ask the API, through the shared pooled client (which retries 429/5xx
+    and network errors with backoff).
+
+    Returns:
+        tuple: (status code, parsed JSON or None, seconds taken)
+
+    Raises:
+        requests.RequestException: On network problems
+        ValueError: If a 200 response is not valid JSON
+    """
+    response = weather_client.default_client().fetch(city, api_key, units, limiter=limiter)
+    return response.status_code, response.data, response.elapsed
+
+
+def _fetch_and_store(key, city, api_key, units, cache, limiter=None):
+    """_fetch_weather(), then remember 200 and 404 answers in weather_cache."""
+    status_code, data, fetch_s = _fetch_weather(city, api_key, units, limiter)
+    if cache and status_code in (200, 404):
+        weather_cache.put(key, status_code, copy.deepcopy(data), fetch_s)
+    return status_code, data, fetch_s
+
+
+def _cached_weather(key, city, api_key, units):
+    """
+    The cached answer for key, as (data, error), or None on a miss.
+    A stale answer is returned and refreshed in the background.
+    """
+    entry, state = weather_cache.get(key)
+    if state == "stale":
+        weather_cache.refresh_in_background(
+            key, lambda: weather_flights.do(key, lambda: _fetch_weather(city, api_key, units)))
+    if entry is None:
+        return None
+    if entry["status"] == 404:
+        return None, f"City '{city}' not found. Please check spelling."
+    return copy.deepcopy(entry["data"]), None  # Callers may modify their copy
+
+
+def _weather_answer(city, status_code, data):
+    """What a response means: (data, None) on success, else (None, error message)."""
+    # TODO: Check status code
+    if status_code == 200:
+        # Success! Every caller gets its own copy of the shared answer
+        return copy.deepcopy(data), None
+    elif status_code == 404:
+        # City not found
+        return None, f"City '{city}' not found. Please check spelling."
+    elif status_code == 401:
+        # Invalid API key
+        return None, "Invalid API key. Please check your credentials."
+    else:
+        # Other error
+        return None, f"API error: {status_code}"
+
+
+def _request_error(error):
+    """A friendly message for an exception raised by _fetch_weather()."""
+    if isinstance(error, requests.Timeout):
+        return "Request timed out. Check your internet connection."
+    if isinstance(error, requests.ConnectionError):
+        return "Connection error. Check your internet connection."
+    if isinstance(error, requests.RequestException):
+        return f"Request error: {error}"
+    return "Invalid JSON response from API"
+
+
+def _lookup_weather(city, api_key, units="metric", cache=True, limiter=None):
+    """
+    get_weather() without the printing: the cache lookup, the request and
+    the meaning of each status code.
+
+    Concurrent lookups of the same (city, units, API key) share one request
+    through weather_flights; an error reaches all of them and is never cached.
+
+    Returns:
+        tuple: (weather data or None, error message or None)
+    """
+    key = weather_cache_key(city, units, api_key)
+    if cache:
+        cached = _cached_weather(key, city, api_key, units)
+        if cached is not None:
+            return cached
+
+    try:
+        status_code, data, _ = weather_flights.do(
+            key, lambda: _fetch_and_store(key, city, api_key, units, cache, limiter))
+    except (requests.RequestException, json.JSONDecodeError) as e:
+        return None, _request_error(e)
+    return _weather_answer(city, status_code, data)
+
+
+async def _lookup_weather_async(city, api_key, units="metric", cache=True):
+    """_lookup_weather() for asyncio: waiting for the request does not block the loop."""
+    key = weather_cache_key(city, units, api_key)
+    if cache:
+        cached = _cached_weather(key, city, api_key, units)
+        if cached is not None:
+            return cached
+
+    try:
+        status_code, data, _ = await weather_flights.do_async(
+            key, lambda: _fetch_and_store(key, city, api_key, units, cache))
+    except (requests.RequestException, json.JSONDecodeError) as e:
+        return None, _request_error(e)
+    return _weather_answer(city, status_code, data)
+
+
+def get_weather(city, api_key, units="metric", cache=True):
     """
     Get current weather data for a specific city from OpenWeatherMap API.
 
+    Answers come from weather_cache when possible (see RESPONSE CACHE above).
+
     Args:
         city (str): City name (e.g., "Miami", "London", "Tokyo")
         api_key (str): Your OpenWeatherMap API key
+        units (str): "metric" (Celsius), "imperial" or "standard"
+        cache (bool): False to always ask the API
 
     Returns:
         dict: Parsed JSON weather data, or None if request fails
@@ -54,59 +352,116 @@ def get_weather(city, api_key):
       }
     }
     """
-    # TODO: Build the API URL
-    # Base URL: http://api.openweathermap.org/data/2.5/weather
-    # Query parameters:
-    #   - q: city name
-    #   - appid: your API key
-    #   - units: "metric" (for Celsius)
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
+    data, error = _lookup_weather(city, api_key, units, cache)
+    if error:
+        print(f"❌ {error}")
+    return data
 
-    try:
-        # TODO: Make the GET request with a 5-second timeout
-        response = requests.get(url, timeout=5)
-
-        # TODO: Check status code
-        if response.status_code == 200:
-            # Success! Parse and return JSON
-            return response.json()
-        elif response.status_code == 404:
-            # City not found
-            print(f"❌ City '{city}' not found. Please check spelling.")
-            return None
-        elif response.status_code == 401:
-            # Invalid API key
-            print("❌ Invalid API key. Please check your credentials.")
-            return None
-        else:
-            # Other error
-            print(f"❌ API error: {response.status_code}")
-            return None
 
-    except requests.Timeout:
-        print("❌ Request timed out. Check your internet connection.")
-        return None
-    except requests.ConnectionError:
-        print("❌ Connection error. Check your internet connection.")
-        return None
-    except requests.RequestException as e:
-        print(f"❌ Request error: {e}")
-        return None
-    except json.JSONDecodeError:
-        print("❌ Invalid JSON response from API")
-        return None
+async def get_weather_async(city, api_key, units="metric", cache=True):
+    """
+    get_weather() for asyncio programs.
+
+    Example:
+        >>> weather = await get_weather_async("Miami", api_key)
+    """
+    data, error = await _lookup_weather_async(city, api_key, units, cache)
+    if error:
+        print(f"❌ {error}")
+    return data
+
+
+# ==============================================================================
+# MANY CITIES AT ONCE
+# ==============================================================================
+# Looking up cities one after another spends almost all of its time waiting
+# for the network. get_weather_many() keeps up to `concurrency` requests in
+# flight on a thread pool (threads are fine here: they wait on sockets, not
+# on the CPU), and a TokenBucket keeps the whole batch under the API's
+# requests-per-minute budget. The free OpenWeatherMap plan allows 60 calls a
+# minute; for a different budget, pass rate_limit (for example the
+# api.rate_limit value from data/config_base.json).
+WEATHER_CONCURRENCY = 8            # Requests in flight at once
+WEATHER_RATE_LIMIT = 60            # Requests per minute (None: unlimited)
+
+
+def get_weather_many(cities, api_key, units="metric", concurrency=WEATHER_CONCURRENCY,
+                     rate_limit=WEATHER_RATE_LIMIT, cache=True):
+    """
+    Get the weather for many cities concurrently.
+
+    Results are yielded as soon as each lookup finishes, so they arrive in
+    completion order, not input order. One failing city never stops the
+    others: its error message is yielded in place of data. Cache hits do
+    not use up any of the rate limit.
 
+    Args:
+        cities (iterable): City names
+        api_key (str): Your OpenWeatherMap API key
+        units (str): "metric" (Celsius), "imperial" or "standard"
+        concurrency (int): Maximum requests in flight at once
+        rate_limit (int): Maximum requests per minute (None: unlimited)
+        cache (bool): False to always ask the API
 
-def format_weather_display(weather_data):
+    Yields:
+        tuple: (city, weather data or None, error message or None)
+
+    Example:
+        >>> for city, data, error in get_weather_many(["Miami", "Oslo"], api_key):
+        ...     print(city, data["main"]["temp"] if data else error)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    limiter = None
+    if rate_limit:
+        # One request per worker may start at once; the burst is part of
+        # the rate_limit budget, never on top of it, and a steady batch
+        # still gets the full rate_limit
+        limiter = weather_client.TokenBucket(rate_limit, per=60.0, burst=concurrency)
+    weather_client.default_client().resize_pool(concurrency)  # One connection per worker
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    futures = {}
+    try:
+        futures = {executor.submit(_lookup_weather, city, api_key, units, cache, limiter): city
+                   for city in cities}
+        for future in as_completed(futures):
+            city = futures[future]
+            try:
+                data, error = future.result()
+            except Exception as e:  # An unexpected bug should not lose the other cities
+                data, error = None, f"Unexpected error: {e}"
+            yield city, data, error
+    finally:
+        # If the caller stops early, drop the lookups that have not started yet
+        # (by hand: shutdown(cancel_futures=True) needs Python 3.9)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+# Labels for each units= value of get_weather (OpenWeatherMap's unit systems)
+UNIT_LABELS = {
+    "metric": {"temp": "°C", "speed": "m/s"},
+    "imperial": {"temp": "°F", "speed": "mph"},
+    "standard": {"temp": "K", "speed": "m/s"},
+}
+
+
+def format_weather_display(weather_data, units="metric"):
     """
     Format weather data for user-friendly display.
 
     Args:
         weather_data (dict): Parsed JSON from OpenWeatherMap API
+        units (str): The units the data was requested in ("metric",
+                     "imperial" or "standard"), for the labels
 
     Returns:
         str: Formatted weather report
     """
+    labels = UNIT_LABELS[units]
+
     # TODO: Extract data from nested JSON structure
     # Hint: Review Module 3 - Nested Data Navigation
 
@@ -131,21 +486,23 @@ def format_weather_display(weather_data):
 ╔══════════════════════════════════════════
 ║ Weather in {city.title()}
 ╠══════════════════════════════════════════
-║ 🌡️  Temperature: {temp}°C (feels like {feels_like}°C)
+║ 🌡️  Temperature: {temp}{labels['temp']} (feels like {feels_like}{labels['temp']})
 ║ ☁️  Conditions:  {description.title()}
 ║ 💧 Humidity:    {humidity}%
-║ 💨 Wind Speed:  {wind_speed} m/s
+║ 💨 Wind Speed:  {wind_speed} {labels['speed']}
 ╚══════════════════════════════════════════
 """
     return report
 
 
-def get_weather_recommendation(weather_data):
+def get_weather_recommendation(weather_data, units="metric"):
     """
     Provide smart recommendations based on weather conditions.
 
     Args:
         weather_data (dict): Parsed JSON from OpenWeatherMap API
+        units (str): The units the data was requested in ("metric",
+                     "imperial" or "standard")
 
     Returns:
         str: Recommendation message
@@ -153,6 +510,11 @@ def get_weather_recommendation(weather_data):
     # TODO: Extract necessary data
     main = weather_data.get('main', {})
     temp = main.get('temp', 20)
+    # The thresholds below are in Celsius
+    if units == "imperial" and 'temp' in main:
+        temp = (temp - 32) * 5 / 9
+    elif units == "standard" and 'temp' in main:
+        temp = temp - 273.15
 
     weather = weather_data.get('weather', [])
     description = weather[0].get('description', '').lower() if weather else ''
@@ -187,11 +549,241 @@ def get_weather_recommendation(weather_data):
         return "📋 Recommendation: Enjoy your day!"
 
 
-def save_weather_history(city, weather_data, filename="weather_history.json"):
+# ==============================================================================
+# QUERY HISTORY
+# ==============================================================================
+# The history is a JSON Lines file: one query per line, only ever appended
+# to. Saving a query writes one short line instead of re-reading and
+# rewriting every query ever made, and showing the last few reads backward
+# from the end of the file instead of parsing all of it.
+#
+#   {"timestamp": "2024-05-01T09:30:12", "city": "Miami", "temperature": 28.5, ...}
+#   {"timestamp": "2024-05-01T09:31:40", "city": "Oslo", "temperature": 4.1, ...}
+#
+# - Rotation: once the file would grow past WEATHER_HISTORY_MAX_BYTES it is
+#   renamed to "<file>.1" (older ones move to .2, .3, ...) and a new file is
+#   started; only WEATHER_HISTORY_BACKUPS old files are kept.
+# - Crash safety: a crash in the middle of a write can leave half a line at
+#   the end of the file. The next save cuts it off before appending, and
+#   readers ignore it.
+# - Migration: an old "weather_history.json" ({"queries": [...]}) is copied
+#   into the new file once and renamed to "weather_history.json.migrated".
+#   A caller that still passes filename="weather_history.json" gets that
+#   file converted in place (the original is kept as ".migrated"), so a
+#   line is never appended to an old-style document.
+WEATHER_HISTORY_FILE = "weather_history.jsonl"
+WEATHER_HISTORY_MAX_BYTES = 1024 * 1024  # Rotate at about 1 MB (~10,000 queries)
+WEATHER_HISTORY_BACKUPS = 3              # Rotated files kept (.1 is the newest)
+HISTORY_TAIL_BLOCK = 8192                # Bytes read per step when reading backward
+
+
+def _legacy_history_path(filename):
+    """Where the old single-document history for filename lived."""
+    return os.path.splitext(filename)[0] + ".json"
+
+
+def _first_line(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.readline()
+    except FileNotFoundError:
+        return b""
+
+
+def _is_legacy_history(path):
+    """True if path holds an old single-document {"queries": [...]} history."""
+    first_line = _first_line(path).strip()
+    if first_line == b"{":
+        return True  # The old file was written with indent=2
+    try:
+        document = json_codec.loads(first_line)
+    except ValueError:
+        return False  # Empty, or a torn JSON Lines entry
+    return isinstance(document, dict) and "queries" in document
+
+
+def migrate_weather_history(filename=WEATHER_HISTORY_FILE, legacy_filename=None):
     """
-    Save weather query to a local JSON file for history tracking.
+    Copy queries from the old {"queries": [...]} history file into the JSON
+    Lines history (before any queries already there), then rename the old
+    file to "<old>.migrated". Does nothing if there is no old file.
 
-    This demonstrates JSON file persistence from Module 2.
+    If filename itself is an old-style file, it is converted in place and
+    the original is kept as "<filename>.migrated".
+
+    Safe to re-run after a crash: if the new file already starts with the
+    old queries, only the rename is finished.
+
+    Returns:
+        int: Number of queries copied
+    """
+    if _is_legacy_history(filename):
+        legacy_filename = filename
+    else:
+        legacy_filename = legacy_filename or _legacy_history_path(filename)
+        if legacy_filename == filename or not os.path.exists(legacy_filename):
+            return 0
+    try:
+        with open(legacy_filename, 'rb') as f:
+            queries = json_codec.load(f).get('queries', [])
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️  Could not migrate old history {legacy_filename}: {e}")
+        return 0
+
+    lines = [json_codec.dumps(entry, compact=True).encode('utf-8') + b"\n"
+             for entry in queries]
+    if legacy_filename == filename:
+        shutil.copy2(filename, filename + ".migrated")  # Keep the original
+        temp_name = filename + ".tmp"
+        with open(temp_name, 'wb') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, filename)  # Atomic: old document or new lines
+        return len(lines)
+
+    copied = 0
+    if lines and _first_line(filename) != lines[0]:
+        temp_name = filename + ".tmp"
+        with open(temp_name, 'wb') as f:
+            f.writelines(lines)
+            try:
+                with open(filename, 'rb') as current:  # Newer queries go after
+                    shutil.copyfileobj(current, f)
+            except FileNotFoundError:
+                pass
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, filename)  # Atomic: all old queries or none
+        copied = len(lines)
+    os.replace(legacy_filename, legacy_filename + ".migrated")
+    return copied
+
+
+def _drop_torn_line(f):
+    """
+    If the file (open in 'a+b' mode) does not end with a newline, a crash
+    cut the last line short: truncate it away.
+
+    Returns:
+        int: Bytes removed
+    """
+    size = f.seek(0, os.SEEK_END)
+    end = size
+    while end > 0:
+        start = max(0, end - HISTORY_TAIL_BLOCK)
+        f.seek(start)
+        block = f.read(end - start)
+        newline = block.rfind(b"\n")
+        if newline == len(block) - 1 and end == size:
+            return 0  # The common case: the last line is complete
+        if newline != -1:
+            end = start + newline + 1
+            break
+        end = start
+    f.truncate(end)
+    return size - end
+
+
+def _rotate_history(filename, backups=WEATHER_HISTORY_BACKUPS):
+    """filename -> filename.1 -> filename.2 ...; the oldest one is deleted."""
+    for number in range(backups, 0, -1):
+        source = filename if number == 1 else f"{filename}.{number - 1}"
+        if os.path.exists(source):
+            os.replace(source, f"{filename}.{number}")
+    if backups <= 0 and os.path.exists(filename):
+        os.remove(filename)
+
+
+def append_weather_history(entry, filename=WEATHER_HISTORY_FILE,
+                           max_bytes=WEATHER_HISTORY_MAX_BYTES,
+                           backups=WEATHER_HISTORY_BACKUPS):
+    """
+    Append one entry to the JSON Lines history (rotating it when full).
+
+    The cost does not depend on how many queries are already saved.
+
+    Raises:
+        OSError: If the file cannot be written
+        ValueError: If the file is an old {"queries": [...]} document
+                    (see migrate_weather_history)
+    """
+    if _is_legacy_history(filename):
+        raise ValueError(f"{filename} is an old-style history; migrate it first")
+    line = json_codec.dumps(entry, compact=True).encode('utf-8') + b"\n"
+    try:
+        size = os.path.getsize(filename)
+    except FileNotFoundError:
+        size = 0
+    if size and size + len(line) > max_bytes:
+        _rotate_history(filename, backups)
+
+    with open(filename, 'a+b') as f:  # Writes always go to the end
+        _drop_torn_line(f)
+        f.write(line)  # A single write: readers never see a mix of two lines
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _tail_lines(path, count):
+    """The last count complete lines of a file, oldest first, read from the end."""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(HISTORY_TAIL_BLOCK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.split(b"\n")
+    lines.pop()  # Text after the last newline: empty, or a torn line
+    if position > 0:
+        lines = lines[1:]  # The first one may be cut off by where we started
+    return lines[-count:] if count > 0 else []
+
+
+def tail_weather_history(count=5, filename=WEATHER_HISTORY_FILE,
+                         backups=WEATHER_HISTORY_BACKUPS):
+    """
+    The most recent count queries, oldest first.
+
+    Reads backward from the end of the history (continuing into rotated
+    files if needed), so only the last few lines are parsed. Lines that
+    are not valid JSON are skipped.
+
+    Returns:
+        list: Query entries (dicts)
+
+    Example:
+        >>> for entry in tail_weather_history(3):
+        ...     print(entry["city"], entry["temperature"])
+    """
+    entries = []
+    paths = [filename] + [f"{filename}.{number}" for number in range(1, backups + 1)]
+    for path in paths:
+        if len(entries) >= count:
+            break
+        try:
+            lines = _tail_lines(path, count - len(entries))
+        except FileNotFoundError:
+            continue
+        older = []
+        for line in lines:
+            try:
+                older.append(json_codec.loads(line))
+            except ValueError:
+                continue  # Skip damaged lines
+        entries = older + entries
+    return entries[-count:] if count > 0 else []
+
+
+def save_weather_history(city, weather_data, filename=WEATHER_HISTORY_FILE):
+    """
+    Save weather query to the local history file.
+
+    This demonstrates JSON file persistence from Module 2 (in the JSON
+    Lines format: see QUERY HISTORY above).
 
     Args:
         city (str): City name
@@ -200,12 +792,8 @@ def save_weather_history(city, weather_data, filename="weather_history.json"):
     """
     import datetime
 
-    # TODO: Load existing history or create new
-    try:
-        with open(filename, 'r') as f:
-            history = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        history = {"queries": []}
+    # Bring over queries saved by older versions (only happens once)
+    migrate_weather_history(filename)
 
     # TODO: Add new entry with timestamp
     entry = {
@@ -214,42 +802,39 @@ def save_weather_history(city, weather_data, filename="weather_history.json"):
         "temperature": weather_data.get('main', {}).get('temp'),
         "description": weather_data.get('weather', [{}])[0].get('description')
     }
-    history['queries'].append(entry)
 
-    # TODO: Save back to file
+    # Append it to the file
     try:
-        with open(filename, 'w') as f:
-            json.dump(history, f, indent=2)
-        print(f"💾 Saved to history ({len(history['queries'])} total queries)")
-    except IOError as e:
+        append_weather_history(entry, filename)
+        print("💾 Saved to history")
+    except (OSError, ValueError) as e:
         print(f"⚠️  Could not save history: {e}")
 
 
-def show_weather_history(filename="weather_history.json"):
-    """Display weather query history."""
+def show_weather_history(filename=WEATHER_HISTORY_FILE):
+    """Display the most recent weather queries."""
+    migrate_weather_history(filename)
+    if _is_legacy_history(filename):
+        print(f"Error reading history: {filename} is an old-style file that could not be migrated")
+        return
     try:
-        with open(filename, 'r') as f:
-            history = json.load(f)
-
-        queries = history.get('queries', [])
+        # Show last 5 queries
+        queries = tail_weather_history(5, filename)
         if not queries:
             print("No history yet!")
             return
 
-        print(f"\n📜 Weather Query History ({len(queries)} entries):")
+        print(f"\n📜 Weather Query History (last {len(queries)} entries):")
         print("─" * 60)
 
-        # Show last 5 queries
-        for entry in queries[-5:]:
+        for entry in queries:
             timestamp = entry['timestamp'][:19]  # Remove milliseconds
             city = entry['city']
             temp = entry['temperature']
             desc = entry['description']
             print(f"{timestamp} | {city}: {temp}°C, {desc}")
 
-    except FileNotFoundError:
-        print("No history file found yet!")
-    except (json.JSONDecodeError, KeyError) as e:
+    except (OSError, KeyError, TypeError) as e:
         print(f"Error reading history: {e}")
 
 
@@ -290,6 +875,7 @@ def main():
     print("\nCommands:")
     print("  - Enter a city name to check weather")
     print("  - Type 'history' to see past queries")
+    print("  - Type 'stats' to see cache statistics")
     print("  - Type 'exit' to quit")
     print()
 
@@ -308,6 +894,13 @@ def main():
             show_weather_history()
             continue
 
+        # Check for cache statistics command
+        if user_input.lower() == 'stats':
+            print(weather_cache.report())
+            print(f"🔗 In-flight sharing: {weather_flights.coalesced} lookups "
+                  f"waited on another's request ({weather_flights.calls} requests made)")
+            continue
+
         # Validate input
         if not user_input:
             print("⚠️  Please enter a city name")
@@ -366,12 +959,51 @@ def test_with_sample_data():
     print(get_weather_recommendation(sample_weather))
 
 
+def benchmark_weather_many(city_count=200, latency=0.05, concurrency_levels=(1, 8, 32)):
+    """
+    Time get_weather_many() against a local stub server (no API key or
+    internet needed) at several concurrency levels.
+
+    Every stub answer takes `latency` seconds, like a real round trip, so
+    the sequential run takes about city_count * latency seconds. The rate
+    limit and the cache are switched off so that only concurrency is
+    measured; a last run shows a rate limit pacing the same batch.
+
+    Example:
+        >>> benchmark_weather_many(100, latency=0.02)
+    """
+    cities = {f"City{i}": {"name": f"City{i}", "main": {"temp": 20 + i % 10}}
+              for i in range(city_count)}
+    names = list(cities) + ["Atlantis"]  # One unknown city shows a per-city error
+
+    with weather_client.StubWeatherServer(cities, latency=latency) as server:
+        previous = weather_client.default_client()
+        weather_client.set_default_client(weather_client.WeatherClient(base_url=server.url))
+        try:
+            print(f"{len(names)} cities, {latency * 1000:.0f} ms per request")
+            runs = [(level, None) for level in concurrency_levels]
+            runs.append((max(concurrency_levels), 60 * city_count // 2))  # ~2 seconds' worth
+            for concurrency, rate_limit in runs:
+                start = time.perf_counter()
+                errors = sum(1 for _, _, error in get_weather_many(
+                    names, server.api_key, concurrency=concurrency,
+                    rate_limit=rate_limit, cache=False) if error)
+                elapsed = time.perf_counter() - start
+                limit = f"{rate_limit}/min" if rate_limit else "no rate limit"
+                print(f"  concurrency {concurrency:3d}, {limit:>14}: {elapsed:6.2f}s "
+                      f"({len(names) / elapsed:6.1f} cities/s, errors: {errors})")
+            print(f"  connections opened: {server.connections}")
+        finally:
+            weather_client.set_default_client(previous)
+
+
 # ==============================================================================
 # ENTRY POINT
 # ==============================================================================
 if __name__ == "__main__":
     # Uncomment the line below to test without API key:
     # test_with_sample_data()
+    # benchmark_weather_many()
 
     # Run the main application:
     main()
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+Course Index - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Answers "what do I need before COMP3100?" and "what does COMP1001 open
+up?" for a course catalog like the one build_course_catalog() writes
+(Problem 2 in 04_JSON_Practice_Problems.py):
+
+    import course_index
+
+    index = course_index.PrerequisiteIndex.from_json_file("courses.json")
+    index.prerequisites("COMP3100")    # ['COMP1001', 'COMP2050']
+    index.unlocks("COMP1001")          # every course that needs it
+
+The index is built once; after that each question is a dictionary lookup
+plus a few bit operations, however long the prerequisite chains are.
+"""
+
+import collections
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+
+
+# ==============================================================================
+# PREREQUISITE INDEX
+# ==============================================================================
+# "Everything X needs" and "everything X unlocks" are reachability questions
+# on the prerequisite graph. PrerequisiteIndex works them out once and stores
+# each answer as a bitset (a Python int, one bit per course), so a query is
+# a dictionary lookup plus a bit test:
+#   needs[X]   = bits of every course X transitively requires
+#   unlocks[X] = bits of every course that transitively requires X
+# Courses named as prerequisites but not in the catalog (e.g. MATH1050 in
+# courses.json) become placeholder nodes until they are added.
+
+class PrerequisiteIndex:
+    """
+    Transitive prerequisite / unlock index over a course catalog.
+
+    Example:
+        >>> index = PrerequisiteIndex([
+        ...     ("COMP1001", "Intro to Computing", 3, []),
+        ...     ("COMP2050", "Data Structures", 4, ["COMP1001"]),
+        ...     ("COMP3100", "Algorithms", 4, ["COMP2050"]),
+        ... ])
+        >>> index.prerequisites("COMP3100")
+        ['COMP1001', 'COMP2050']
+        >>> index.requires("COMP3100", "COMP1001")
+        True
+        >>> index.unlocks("COMP1001")
+        ['COMP2050', 'COMP3100']
+
+    Raises:
+        ValueError: If the prerequisites form a cycle
+    """
+
+    def __init__(self, courses=()):
+        self._bit = {}        # code -> bit position
+        self._codes = []      # bit position -> code
+        self._direct = {}     # code -> tuple of direct prerequisites (None = placeholder)
+        self._dependents = {}  # code -> set of courses listing it directly
+        self._needs = []      # bit position -> transitive prerequisite bitset
+        self._unlocks = []    # bit position -> transitive dependent bitset
+        self._order = []      # Topological order
+        self._rank = {}       # code -> position in self._order
+        self._decoded = {}    # Memoized code lists per (kind, code)
+        for course in courses:
+            code, prerequisites = self._course_fields(course)
+            self._define(code, prerequisites)
+        self._rebuild()
+
+    @classmethod
+    def from_json_file(cls, json_file_path):
+        """Build the index from a catalog file shaped like courses.json."""
+        return cls(json_codec.load_path(json_file_path).get("courses", []))
+
+    @staticmethod
+    def _course_fields(course):
+        if isinstance(course, dict):
+            return course["code"], course.get("prerequisites", [])
+        return course[0], course[3]
+
+    def _node(self, code):
+        """Bit position of a course, creating a placeholder if it is new."""
+        if code not in self._bit:
+            self._bit[code] = len(self._codes)
+            self._codes.append(code)
+            self._direct[code] = None
+            self._dependents[code] = set()
+            self._needs.append(0)
+            self._unlocks.append(0)
+        return self._bit[code]
+
+    def _define(self, code, prerequisites):
+        self._node(code)
+        old = self._direct[code] or ()
+        for prerequisite in old:
+            self._dependents[prerequisite].discard(code)
+        self._direct[code] = tuple(dict.fromkeys(prerequisites))
+        for prerequisite in self._direct[code]:
+            self._node(prerequisite)
+            self._dependents[prerequisite].add(code)
+
+    # -- building --------------------------------------------------------------
+    def _topological_order(self):
+        """Kahn's algorithm; raises ValueError naming a cycle if there is one."""
+        remaining = {code: len(self._direct[code] or ()) for code in self._codes}
+        ready = collections.deque(code for code in self._codes if remaining[code] == 0)
+        order = []
+        while ready:
+            code = ready.popleft()
+            order.append(code)
+            for dependent in sorted(self._dependents[code], key=self._bit.get):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) < len(self._codes):
+            raise ValueError("Prerequisite cycle: "
+                             + " requires ".join(self._find_cycle(remaining)))
+        return order
+
+    def _find_cycle(self, remaining):
+        """Walk prerequisites among the courses Kahn could not order."""
+        code = next(code for code in self._codes if remaining[code] > 0)
+        seen = {}
+        path = []
+        while code not in seen:
+            seen[code] = len(path)
+            path.append(code)
+            code = next(p for p in self._direct[code] if remaining[p] > 0)
+        return path[seen[code]:] + [code]
+
+    def _rebuild(self):
+        """Recompute the order and every bitset from scratch, O(V x E / 64)."""
+        order = self._topological_order()
+        for code in order:
+            bits = 0
+            for prerequisite in self._direct[code] or ():
+                position = self._bit[prerequisite]
+                bits |= (1 << position) | self._needs[position]
+            self._needs[self._bit[code]] = bits
+        for code in reversed(order):
+            bits = 0
+            for dependent in self._dependents[code]:
+                position = self._bit[dependent]
+                bits |= (1 << position) | self._unlocks[position]
+            self._unlocks[self._bit[code]] = bits
+        self._order = order
+        self._rank = {code: rank for rank, code in enumerate(order)}
+        self._decoded.clear()
+
+    def add_course(self, code, prerequisites=()):
+        """
+        Add a course (or redefine one) and update the index.
+
+        A brand-new course that nothing depends on yet is added in time
+        proportional to its number of prerequisites; filling in a
+        placeholder or changing a course's prerequisites recomputes the
+        index. On a cycle, ValueError is raised and the index is unchanged.
+        """
+        prerequisites = tuple(dict.fromkeys(prerequisites))
+        if code in prerequisites:
+            raise ValueError(f"Prerequisite cycle: {code} requires itself")
+        if code not in self._bit:
+            first_new = len(self._codes)
+            for prerequisite in prerequisites:
+                self._node(prerequisite)
+            self._define(code, prerequisites)
+            position = self._bit[code]
+            bits = 0
+            for prerequisite in prerequisites:
+                bits |= (1 << self._bit[prerequisite]) | self._needs[self._bit[prerequisite]]
+            self._needs[position] = bits
+            new_bit = 1 << position
+            remaining = bits
+            while remaining:  # Every prerequisite now also unlocks this course
+                low = remaining & -remaining
+                self._unlocks[low.bit_length() - 1] |= new_bit
+                remaining ^= low
+            # New placeholders have no prerequisites, so appending them and
+            # then the course keeps the order valid
+            for new_code in self._codes[first_new:]:
+                self._rank[new_code] = len(self._order)
+                self._order.append(new_code)
+            self._decoded.clear()
+            return
+
+        for prerequisite in prerequisites:
+            if prerequisite in self._bit and self.requires(prerequisite, code):
+                raise ValueError(f"Prerequisite cycle: {code} requires {prerequisite}, "
+                                 f"which requires {code}")
+        self._define(code, prerequisites)
+        self._rebuild()
+
+    # -- queries ---------------------------------------------------------------
+    def _decode(self, bits):
+        codes = []
+        while bits:
+            low = bits & -bits
+            codes.append(self._codes[low.bit_length() - 1])
+            bits ^= low
+        codes.sort(key=self._rank.get)
+        return codes
+
+    def prerequisite_mask(self, code):
+        """Bitset of every course code transitively requires."""
+        return self._needs[self._bit[code]]
+
+    def unlock_mask(self, code):
+        """Bitset of every course that transitively requires code."""
+        return self._unlocks[self._bit[code]]
+
+    def requires(self, code, prerequisite):
+        """True if code needs prerequisite, directly or indirectly."""
+        return bool(self._needs[self._bit[code]] >> self._bit[prerequisite] & 1)
+
+    def prerequisites(self, code):
+        """Every course code transitively requires, in a valid taking order."""
+        key = ("needs", code)
+        if key not in self._decoded:
+            self._decoded[key] = self._decode(self.prerequisite_mask(code))
+        return list(self._decoded[key])
+
+    def unlocks(self, code):
+        """Every course that transitively requires code, in taking order."""
+        key = ("unlocks", code)
+        if key not in self._decoded:
+            self._decoded[key] = self._decode(self.unlock_mask(code))
+        return list(self._decoded[key])
+
+    def topological_order(self):
+        """All courses (placeholders included) so that prerequisites come first."""
+        return list(self._order)
+
+    def placeholders(self):
+        """Courses referenced as prerequisites but never added themselves."""
+        return [code for code in self._codes if self._direct[code] is None]
+
+    def __contains__(self, code):
+        return code in self._bit
+
+    def __len__(self):
+        return len(self._codes)
@@ -0,0 +1,232 @@
+"""
+CSV Convert - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Converting CSV files of any size to JSON (Problem 9 in
+04_JSON_Practice_Problems.py converts a CSV string with it):
+
+    import csv_convert
+
+    csv_convert.convert_csv_file_to_json("people.csv", "people.json")
+    csv_convert.convert_csv_file_to_json("people.csv", "people.jsonl",
+                                         output_format="jsonl", infer_types=True)
+"""
+
+import csv
+import io
+import itertools
+import os
+import re
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+import record_files  # Process-pool map (see record_files.py)
+
+
+# ==============================================================================
+# CHUNKED CONVERSION
+# ==============================================================================
+# Splitting on commas breaks as soon as a field is quoted ("Miami, FL"), and
+# reading the whole CSV into one string does not work for multi-GB files.
+# convert_csv_file_to_json reads the file in chunks, cuts each chunk at a
+# line break that is NOT inside quotes (an even number of '"' before it),
+# and lets a pool of worker processes parse and serialize the chunks with
+# the csv module (RFC 4180 quoting). Results are written in input order.
+
+CSV_CHUNK_SIZE = 4 * 1024 * 1024
+CSV_SAMPLE_ROWS = 1000
+
+# Digit strings with a leading zero ("02134", "007") are codes such as ZIP
+# codes, not numbers, so they stay strings; "0" and "0.5" are still numbers
+_CSV_INT = re.compile(r'[+-]?(0|[1-9]\d*)')
+_CSV_FLOAT = re.compile(r'[+-]?((0|[1-9]\d*)(\.\d*)?|\.\d+)([eE][+-]?\d+)?')
+
+
+def _last_safe_newline(data):
+    """
+    Index just past the last line break outside quotes, or 0 if none.
+    data must start at a record boundary (quote count even so far).
+    """
+    # One pass from the end: each byte is counted once, so quote-heavy
+    # chunks stay O(n)
+    quotes_before = data.count(b'"')
+    end = len(data)
+    pos = data.rfind(b"\n")
+    while pos != -1:
+        quotes_before -= data.count(b'"', pos, end)
+        end = pos
+        if quotes_before % 2 == 0:
+            return pos + 1
+        pos = data.rfind(b"\n", 0, pos)
+    return 0
+
+
+def _first_safe_newline(data):
+    """Index just past the first line break outside quotes, or 0 if none."""
+    quotes = 0
+    start = 0
+    pos = data.find(b"\n")
+    while pos != -1:
+        quotes += data.count(b'"', start, pos)
+        if quotes % 2 == 0:
+            return pos + 1
+        start = pos
+        pos = data.find(b"\n", pos + 1)
+    return 0
+
+
+def _iter_csv_chunks(f, chunk_size):
+    """Yield byte chunks of a CSV file that each end at a record boundary."""
+    pending = b""
+    while True:
+        block = f.read(chunk_size)
+        if isinstance(block, str):
+            block = block.encode('utf-8')
+        if not block:
+            if pending:
+                yield pending
+            return
+        pending += block
+        cut = _last_safe_newline(pending)
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+
+
+def _infer_column_types(header, rows):
+    """Pick int, float, bool or str for each column from sample rows."""
+    types = {}
+    for column, name in enumerate(header):
+        values = [row[column] for row in rows if column < len(row) and row[column] != ""]
+        if not values:
+            types[name] = "str"
+        elif all(_CSV_INT.fullmatch(value) for value in values):
+            types[name] = "int"
+        elif all(_CSV_FLOAT.fullmatch(value) for value in values):
+            types[name] = "float"
+        elif all(value.lower() in ("true", "false") for value in values):
+            types[name] = "bool"
+        else:
+            types[name] = "str"
+    return types
+
+
+def _convert_value(value, type_name):
+    """Convert one CSV field; values that don't fit the type stay strings."""
+    if type_name == "str":
+        return value
+    if value == "":
+        return None
+    # Same patterns as the inference, so "02134" or "1_000" outside the
+    # sampled rows stays a string too
+    if type_name == "int":
+        return int(value) if _CSV_INT.fullmatch(value) else value
+    if type_name == "float":
+        return float(value) if _CSV_FLOAT.fullmatch(value) else value
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+
+def _parse_csv_chunk(task):
+    """
+    Worker: parse one chunk and return (serialized text, record count).
+
+    Runs in a separate process, so it only uses its arguments.
+    """
+    data, header, types, output_format, indent = task
+    pad = " " * (2 * indent)
+    pieces = []
+    for row in csv.reader(io.StringIO(data.decode('utf-8'), newline='')):
+        if not row:
+            continue
+        record = dict(zip(header, row))
+        if types:
+            record = {name: _convert_value(value, types[name]) for name, value in record.items()}
+        if output_format == "jsonl":
+            pieces.append(json_codec.dumps(record) + "\n")
+        else:
+            pieces.append(pad + json_codec.dumps(record, indent=indent).replace("\n", "\n" + pad))
+    separator = "" if output_format == "jsonl" else ",\n"
+    return separator.join(pieces), len(pieces)
+
+
+def convert_csv_file_to_json(source, output_file, output_format="records", infer_types=False,
+                             workers=None, chunk_size=CSV_CHUNK_SIZE, indent=2):
+    """
+    Convert a CSV file to JSON without loading it all into memory.
+
+    Handles quoted fields (commas, quotes and line breaks inside quotes) as
+    described in RFC 4180. Chunks are parsed in parallel by worker processes,
+    so large files convert faster on machines with more cores.
+
+    Args:
+        source: Path to a CSV file, or an open file object (text or binary)
+        output_file (str): Path to save JSON output
+        output_format (str): "records" for {"records": [...]} or
+                             "jsonl" for one JSON object per line
+        infer_types (bool): Turn numbers and true/false into JSON numbers and
+                            booleans, using types guessed from the first
+                            CSV_SAMPLE_ROWS rows
+        workers (int): Number of processes (None = all cores, 1 = no pool)
+        chunk_size (int): Bytes per chunk handed to a worker
+        indent (int): Indentation for the "records" format
+
+    Returns:
+        int: Number of records written
+
+    Raises:
+        FileNotFoundError: If the source file does not exist
+        ValueError: If output_format is unknown or the CSV has no header
+
+    Example:
+        >>> convert_csv_file_to_json("people.csv", "people.jsonl",
+        ...                          output_format="jsonl", infer_types=True)
+    """
+    if output_format not in ("records", "jsonl"):
+        raise ValueError("output_format must be 'records' or 'jsonl'")
+    workers = workers or os.cpu_count() or 1
+
+    f = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        chunks = _iter_csv_chunks(f, chunk_size)
+        first = next(chunks, b"")
+        if first.startswith(b"\xef\xbb\xbf"):
+            first = first[3:]  # UTF-8 byte order mark written by Excel
+        cut = _first_safe_newline(first) or len(first)
+        header_rows = list(csv.reader(io.StringIO(first[:cut].decode('utf-8'), newline='')))
+        if not header_rows or not header_rows[0]:
+            raise ValueError("CSV has no header row")
+        header = header_rows[0]
+        first = first[cut:]
+
+        types = None
+        if infer_types:
+            sample = list(itertools.islice(
+                csv.reader(io.StringIO(first.decode('utf-8'), newline='')), CSV_SAMPLE_ROWS))
+            types = _infer_column_types(header, sample)
+
+        def tasks():
+            if first:
+                yield (first, header, types, output_format, indent)
+            for chunk in chunks:
+                yield (chunk, header, types, output_format, indent)
+
+        temp_name = output_file + ".tmp"
+        with open(temp_name, 'w', encoding='utf-8') as out:
+            if output_format == "records":
+                out.write("{\n" + " " * indent + '"records": [')
+            count = 0
+            for text, chunk_count in record_files.map_in_order(_parse_csv_chunk, tasks(), workers):
+                if chunk_count == 0:
+                    continue
+                if output_format == "records":
+                    out.write("\n" if count == 0 else ",\n")
+                out.write(text)
+                count += chunk_count
+            if output_format == "records":
+                out.write(("\n" + " " * indent + "]" if count else "]") + "\n}")
+        os.replace(temp_name, output_file)
+        return count
+    finally:
+        if f is not source:
+            f.close()
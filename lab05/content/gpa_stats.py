@@ -0,0 +1,219 @@
+"""
+GPA Stats - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+The statistics behind calculate_student_gpas() (Problem 3 in
+04_JSON_Practice_Problems.py), collected in one pass over the GPAs:
+
+    import gpa_stats
+
+    stats = gpa_stats.GpaStats()
+    stats.update([3.8, 3.6, 2.9])
+    stats.summary()["median_gpa"]       # 3.6
+
+    # Files are streamed (never loaded whole) and can be combined
+    fall = gpa_stats.stats_for_file("fall.json")      # None if unreadable
+    fall.merge(gpa_stats.stats_for_file("spring.json"))
+"""
+
+import bisect
+import itertools
+import math
+import random
+
+import record_files  # Streaming reads of record files (see record_files.py)
+
+
+# ==============================================================================
+# STREAMING STATISTICS
+# ==============================================================================
+# Everything in the summary is collected in ONE pass over the GPAs, in
+# memory that does not grow with the number of students.
+#   - count / mean / variance: Welford's running update (no sum of squares,
+#     so no precision loss on large inputs)
+#   - min / max / histogram: plain counters
+#   - median / p90 / p99: a KLL quantile sketch (approximate, bounded size)
+# Two GpaStats can be merged, so files can be summarized in separate
+# processes and combined afterwards.
+
+GPA_SCALE = 4.0              # Highest possible GPA
+GPA_HISTOGRAM_WIDTH = 0.5    # Width of one histogram bucket
+QUANTILE_SKETCH_K = 200      # Sketch accuracy (larger = more accurate, more memory)
+
+
+class _QuantileSketch:
+    """
+    KLL sketch: approximate quantiles of a stream in O(k log n) memory.
+
+    Values are kept in levels; a value in level h stands for 2**h original
+    values. When a level fills up it is sorted and every other value is
+    promoted to the next level, halving its size. Up to about k values the
+    answers are exact.
+    """
+
+    def __init__(self, k=QUANTILE_SKETCH_K, seed=None):
+        self.k = k
+        self.levels = [[]]
+        self.size = 0
+        self.max_size = self._capacity(0)
+        self._random = random.Random(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self):
+        self.levels.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self):
+        for h, level in enumerate(self.levels):
+            if len(level) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self._grow()
+                level.sort()
+                # Keep the odd one out (if any) at this level
+                leftover = [level.pop()] if len(level) % 2 else []
+                offset = self._random.randint(0, 1)
+                self.levels[h + 1].extend(level[offset::2])
+                self.levels[h] = leftover
+                break
+        self.size = sum(len(level) for level in self.levels)
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self._grow()
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self.size = sum(len(level) for level in self.levels)
+        while self.size >= self.max_size:
+            self._compress()
+
+    def quantiles(self, fractions):
+        """Return the value at each fraction (0.0-1.0) of the sorted stream."""
+        weighted = sorted((value, 1 << h) for h, level in enumerate(self.levels)
+                          for value in level)
+        if not weighted:
+            return [None] * len(fractions)
+        total = sum(weight for _, weight in weighted)
+        cumulative = list(itertools.accumulate(weight for _, weight in weighted))
+        results = []
+        for fraction in fractions:
+            # Nearest rank: the first value covering fraction * total items
+            rank = max(1, math.ceil(fraction * total))
+            position = min(bisect.bisect_left(cumulative, rank), len(weighted) - 1)
+            results.append(weighted[position][0])
+        return results
+
+
+class GpaStats:
+    """
+    Mergeable one-pass summary of a stream of GPAs.
+
+    Example:
+        >>> stats = GpaStats()
+        >>> stats.update([3.8, 3.6, 2.9])
+        >>> other = GpaStats()
+        >>> other.add(3.1)
+        >>> stats.merge(other)
+        >>> stats.summary()["total_students"]
+        4
+    """
+
+    def __init__(self, sketch_k=QUANTILE_SKETCH_K):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared distances from the mean
+        self.lowest = None
+        self.highest = None
+        self.buckets = [0] * math.ceil(GPA_SCALE / GPA_HISTOGRAM_WIDTH)
+        self.sketch = _QuantileSketch(sketch_k)
+
+    def add(self, gpa):
+        self.count += 1
+        delta = gpa - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (gpa - self.mean)
+        if self.lowest is None or gpa < self.lowest:
+            self.lowest = gpa
+        if self.highest is None or gpa > self.highest:
+            self.highest = gpa
+        # Out-of-scale values land in the first or last bucket
+        bucket = int(gpa / GPA_HISTOGRAM_WIDTH)
+        self.buckets[min(max(bucket, 0), len(self.buckets) - 1)] += 1
+        self.sketch.add(gpa)
+
+    def update(self, gpas):
+        for gpa in gpas:
+            self.add(gpa)
+
+    def merge(self, other):
+        """Fold another GpaStats into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.mean, self._m2 = other.mean, other._m2
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count += other.count
+        self.lowest = other.lowest if self.lowest is None else min(self.lowest, other.lowest)
+        self.highest = other.highest if self.highest is None else max(self.highest, other.highest)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.sketch.merge(other.sketch)
+
+    @property
+    def variance(self):
+        """Population variance (0.0 for fewer than two GPAs)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def histogram(self):
+        """Return {"3.5-4.0": count, ...} for every bucket."""
+        labels = {}
+        for i, count in enumerate(self.buckets):
+            low = i * GPA_HISTOGRAM_WIDTH
+            labels[f"{low:.1f}-{min(low + GPA_HISTOGRAM_WIDTH, GPA_SCALE):.1f}"] = count
+        return labels
+
+    def summary(self):
+        """Return the calculate_student_gpas result dict."""
+        if self.count == 0:
+            return {"total_students": 0, "average_gpa": 0.0, "highest_gpa": None,
+                    "lowest_gpa": None, "stddev_gpa": 0.0, "median_gpa": None,
+                    "p90_gpa": None, "p99_gpa": None, "gpa_histogram": self.histogram()}
+        median, p90, p99 = self.sketch.quantiles([0.5, 0.9, 0.99])
+        return {
+            "total_students": self.count,
+            "average_gpa": round(self.mean, 2),
+            "highest_gpa": self.highest,
+            "lowest_gpa": self.lowest,
+            "stddev_gpa": round(self.stddev, 3),
+            "median_gpa": median,   # Approximate once there are more than
+            "p90_gpa": p90,         # about QUANTILE_SKETCH_K students
+            "p99_gpa": p99,
+            "gpa_histogram": self.histogram(),
+        }
+
+
+def stats_for_file(json_file_path):
+    """Stream one file's students into a GpaStats (None if unreadable)."""
+    stats = GpaStats()
+    try:
+        stats.update(student["gpa"]
+                     for student in record_files.iter_records(json_file_path, "students")
+                     if "gpa" in student)
+    except (OSError, ValueError):
+        return None
+    return stats
@@ -0,0 +1,451 @@
+"""
+Inventory Store - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Storage pieces behind the inventory manager (Problem 4 in
+04_JSON_Practice_Problems.py). The functions there (load_inventory,
+add_product, ...) decide WHAT changes; this module decides how changes
+reach the disk and how products are kept in memory:
+
+    import inventory_store
+
+    products = inventory_store.CompactProductStore()
+    products["P001"] = {"name": "Laptop", "quantity": 5, "price": 999.99}
+    products.total_value()              # 4999.95
+
+- INVENTORY: the dict load_inventory returns, with its journal and
+  running total kept beside the data instead of inside it
+- JOURNAL: append-only log of changes, so a change costs one short line
+  instead of rewriting the whole file
+- COMPACT PRODUCT STORE: products in typed arrays instead of a dict of
+  dicts (a few dozen bytes per product instead of several hundred)
+- RUNNING TOTAL: an accurate float sum that can be kept up to date
+"""
+
+import math
+import numbers
+import operator
+import os
+import time
+from array import array
+from collections.abc import MutableMapping
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; CompactProductStore works without it
+    numpy = None
+
+
+# ==============================================================================
+# INVENTORY
+# ==============================================================================
+class Inventory(dict):
+    """
+    The dict returned by load_inventory: {"products": {...}}.
+
+    The journal and the running total are attributes, not keys, so code
+    that iterates over the inventory or saves it only ever sees the data.
+    A plain dict works with the inventory functions too; it just has no
+    journal and no running total.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.journal = None   # InventoryJournal, if opened with journal=True
+        self.total = None     # RunningTotal, once calculate_total_value ran
+
+
+# ==============================================================================
+# JOURNAL
+# ==============================================================================
+# Rewriting the whole inventory file on every change gets slow once it holds
+# millions of products. With journaling turned on, add_product and
+# update_quantity append one small line to "<filename>.journal" instead, and
+# the full file (the snapshot) is only rewritten when the journal is compacted.
+#
+# Journal lines are JSON arrays that start with a sequence number:
+#   [17, "add", "P001", "Laptop", 5, 999.99]
+#   [18, "qty", "P001", -2]
+# The snapshot remembers the last sequence number it contains, so replaying
+# the journal after a crash never applies the same change twice.
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class InventoryJournal:
+    """Append-only mutation log attached to an inventory dict."""
+
+    def __init__(self, filename, seq, valid_size, fsync_policy, compact_every,
+                 fsync_interval=1.0):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}")
+        self.filename = filename
+        self.path = filename + ".journal"
+        self.seq = seq
+        self.fsync_policy = fsync_policy
+        self.compact_every = compact_every
+        self.fsync_interval = fsync_interval
+        self.entries = 0
+        self.last_fsync = time.monotonic()
+        self.file = open(self.path, 'ab')
+        # Drop a half-written last line left behind by a crash
+        if self.file.tell() > valid_size:
+            self.file.truncate(valid_size)
+            self.file.seek(valid_size)
+
+    def _sync(self, force=False):
+        self.file.flush()
+        if self.fsync_policy == "never":
+            return
+        now = time.monotonic()
+        if force or self.fsync_policy == "always" or now - self.last_fsync >= self.fsync_interval:
+            os.fsync(self.file.fileno())
+            self.last_fsync = now
+
+    def record(self, *mutation):
+        """Append one mutation (written BEFORE it is applied in memory)."""
+        self.seq += 1
+        line = json_codec.dumps([self.seq, *mutation], compact=True)
+        self.file.write(line.encode('utf-8') + b"\n")
+        self.entries += 1
+        self._sync()
+
+    def needs_compaction(self):
+        return self.compact_every is not None and self.entries >= self.compact_every
+
+    def compact(self, inventory):
+        """Fold the journal into a fresh snapshot, then empty the journal."""
+        snapshot = {"products": inventory["products"], "journal_seq": self.seq}
+        temp_name = self.filename + ".tmp"
+        with open(temp_name, 'wb') as f:
+            json_codec.dump(snapshot, f, compact=True, default=json_default)
+            f.flush()
+            if self.fsync_policy != "never":
+                os.fsync(f.fileno())
+        # Atomic: readers see either the old snapshot or the new one
+        os.replace(temp_name, self.filename)
+        self.file.truncate(0)
+        self.file.seek(0)
+        self.entries = 0
+        self._sync(force=True)
+
+    def close(self):
+        self._sync(force=True)
+        self.file.close()
+
+
+def whole_number(value):
+    """
+    Return value as an int if it is a whole number (5.0 is accepted as 5).
+
+    Raises:
+        TypeError: For 2.5, "5", None, NaN, ...
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return operator.index(value)
+
+
+def check_product(products, product):
+    """
+    Check a product dict before it is journaled or stored.
+
+    Returns the product as the store will hold it: a CompactProductStore
+    needs quantity as a 64-bit int and price as a float, a dict keeps the
+    values as given.
+
+    Raises:
+        TypeError: If name is not a string, quantity is not a whole number
+                   or price is not a number
+        OverflowError: If a CompactProductStore cannot hold the quantity
+    """
+    if not isinstance(product["name"], str):
+        raise TypeError(f"name must be a string, not {type(product['name']).__name__}")
+    whole_number(product["quantity"])
+    if not isinstance(product["price"], numbers.Real):
+        raise TypeError(f"price must be a number, not {type(product['price']).__name__}")
+    if isinstance(products, CompactProductStore):
+        return products.normalize(product)
+    return product
+
+
+def check_quantity_change(products, product_id, quantity_change):
+    """
+    Check an update_quantity change before it is journaled or applied.
+
+    Raises:
+        TypeError: If quantity_change is not a whole number
+        OverflowError: If a CompactProductStore cannot hold the new quantity
+    """
+    whole_number(quantity_change)
+    if isinstance(products, CompactProductStore):
+        products.check_quantity(products[product_id]["quantity"] + quantity_change)
+
+
+def _apply_mutation(products, mutation):
+    """
+    Apply one journal entry (without its sequence number) to products.
+
+    Raises:
+        ValueError: If the entry is malformed (products are left unchanged)
+    """
+    try:
+        if mutation[0] == "add":
+            _, product_id, name, quantity, price = mutation
+            products[product_id] = check_product(
+                products, {"name": name, "quantity": quantity, "price": price})
+        elif mutation[0] == "qty":
+            _, product_id, quantity_change = mutation
+            if product_id in products:
+                check_quantity_change(products, product_id, quantity_change)
+                change_quantity(products, product_id, quantity_change)
+        else:
+            raise ValueError(f"unknown change {mutation[0]!r}")
+    except (TypeError, ValueError, OverflowError) as error:
+        raise ValueError(f"malformed journal entry {mutation!r}: {error}") from error
+
+
+def change_quantity(products, product_id, quantity_change):
+    """Add quantity_change to one product, in either kind of product store."""
+    if isinstance(products, CompactProductStore):
+        products.add_quantity(product_id, quantity_change)
+    else:
+        products[product_id]["quantity"] += quantity_change
+
+
+def replay_journal(products, journal_path, snapshot_seq):
+    """
+    Re-apply journal entries newer than the snapshot.
+
+    Malformed entries (a quantity of "3", a missing field, ...) are skipped,
+    so one bad line cannot stop the inventory from loading.
+
+    Returns:
+        tuple: (last sequence number, size in bytes of the valid journal)
+    """
+    seq = snapshot_seq
+    valid_size = 0
+    try:
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Crash in the middle of a write
+                try:
+                    entry = json_codec.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                if not _is_journal_entry(entry):
+                    continue
+                if entry[0] > seq:
+                    try:
+                        _apply_mutation(products, entry[1:])
+                    except ValueError:
+                        pass  # Skip it, but keep its sequence number used
+                    seq = entry[0]
+    except FileNotFoundError:
+        pass
+    return seq, valid_size
+
+
+def _is_journal_entry(entry):
+    """True for [seq, change, ...] with an integer sequence number."""
+    return (isinstance(entry, list) and len(entry) > 1
+            and isinstance(entry[0], int) and not isinstance(entry[0], bool))
+
+
+def last_journal_seq(journal_path):
+    """Sequence number of the last complete entry in a journal (0 if none)."""
+    seq = 0
+    try:
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json_codec.loads(line)
+                except ValueError:
+                    break
+                if _is_journal_entry(entry):
+                    seq = entry[0]
+    except FileNotFoundError:
+        pass
+    return seq
+
+
+# ==============================================================================
+# COMPACT PRODUCT STORE
+# ==============================================================================
+# The same products as a dict of dicts, but kept in parallel typed arrays
+# (one row per product). A dict of dicts costs several hundred bytes per
+# product; a row here costs a few dozen. Names are interned so repeated
+# names ("USB Cable") are stored once.
+
+class CompactProductStore(MutableMapping):
+    """
+    Array-backed replacement for inventory["products"].
+
+    Behaves like a dict of product dicts: store["P001"] returns
+    {"name": ..., "quantity": ..., "price": ...} and store["P001"] = {...}
+    adds or replaces a product. Returned dicts are copies, so quantities
+    must be changed with update_quantity (or add_quantity), not in place.
+    load_inventory(filename, compact=True) puts the products in one.
+
+    Example:
+        >>> store = CompactProductStore()
+        >>> store["P001"] = {"name": "Laptop", "quantity": 5, "price": 999.99}
+        >>> store.total_value()
+        4999.95
+    """
+
+    def __init__(self, products=None):
+        self._rows = {}                 # product id -> row number
+        self._ids = []                  # row number -> product id
+        self._name_rows = array('l')    # row number -> position in _names
+        self._names = []                # interned name table
+        self._name_lookup = {}          # name -> position in _names
+        self._quantity = array('q')
+        self._price = array('d')
+        for product_id, product in (products or {}).items():
+            self[product_id] = product
+
+    def _intern(self, name):
+        position = self._name_lookup.get(name)
+        if position is None:
+            position = len(self._names)
+            self._names.append(name)
+            self._name_lookup[name] = position
+        return position
+
+    def __getitem__(self, product_id):
+        row = self._rows[product_id]
+        return {"name": self._names[self._name_rows[row]],
+                "quantity": self._quantity[row],
+                "price": self._price[row]}
+
+    @staticmethod
+    def check_quantity(quantity):
+        """
+        Return quantity as an int that fits the quantity column.
+
+        Raises:
+            TypeError: If it is not a whole number (5.0 is accepted as 5)
+            OverflowError: If it does not fit in 64 bits
+        """
+        quantity = whole_number(quantity)  # Rejects 2.5, "5", None, ...
+        if not -2**63 <= quantity < 2**63:
+            raise OverflowError(f"quantity {quantity} does not fit in 64 bits")
+        return quantity
+
+    @classmethod
+    def normalize(cls, product):
+        """
+        Check a product dict and return it with quantity as int and price as
+        float, so a bad value is rejected before any column is touched.
+
+        Raises:
+            KeyError: If "name", "quantity" or "price" is missing
+            TypeError, ValueError, OverflowError: If a value has the wrong type
+        """
+        return {"name": product["name"],
+                "quantity": cls.check_quantity(product["quantity"]),
+                "price": float(product["price"])}
+
+    def __setitem__(self, product_id, product):
+        product = self.normalize(product)  # Validate first: all columns or none
+        name = self._intern(product["name"])
+        row = self._rows.get(product_id)
+        if row is None:
+            self._rows[product_id] = len(self._ids)
+            self._ids.append(product_id)
+            self._name_rows.append(name)
+            self._quantity.append(product["quantity"])
+            self._price.append(product["price"])
+        else:
+            self._name_rows[row] = name
+            self._quantity[row] = product["quantity"]
+            self._price[row] = product["price"]
+
+    def __delitem__(self, product_id):
+        # Move the last row into the hole so the arrays stay dense
+        row = self._rows.pop(product_id)
+        last_id = self._ids.pop()
+        for column in (self._name_rows, self._quantity, self._price):
+            last_value = column.pop()
+            if last_id != product_id:
+                column[row] = last_value
+        if last_id != product_id:
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, product_id):
+        return product_id in self._rows
+
+    def add_quantity(self, product_id, quantity_change):
+        row = self._rows[product_id]
+        self._quantity[row] = self.check_quantity(self._quantity[row] + quantity_change)
+
+    def total_value(self):
+        """Dot product of the price and quantity columns."""
+        if numpy is not None and len(self._ids):
+            quantity = numpy.frombuffer(self._quantity, dtype=numpy.int64)
+            price = numpy.frombuffer(self._price, dtype=numpy.float64)
+            return float(numpy.dot(quantity, price))
+        # Without NumPy the multiply-and-add still runs in C, not a Python loop
+        return math.fsum(map(operator.mul, self._quantity, self._price))
+
+
+def json_default(obj):
+    """Let json_codec.dump write a CompactProductStore like a normal dict."""
+    if isinstance(obj, CompactProductStore):
+        return dict(obj.items())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# ==============================================================================
+# RUNNING TOTAL
+# ==============================================================================
+# calculate_total_value is called far more often than the inventory changes,
+# so an Inventory keeps a RunningTotal of price × quantity that add_product
+# and update_quantity adjust, instead of summing every product each time.
+
+class RunningTotal:
+    """
+    A float sum with Neumaier (improved Kahan) compensation.
+
+    Adding and subtracting millions of prices in plain floating point slowly
+    drifts away from the true total; the compensation term keeps the lost
+    low-order bits so the result stays as accurate as math.fsum.
+    """
+
+    def __init__(self, value=0.0):
+        self.sum = float(value)
+        self.compensation = 0.0
+        self.reads = 0
+
+    def add(self, amount):
+        new_sum = self.sum + amount
+        if abs(self.sum) >= abs(amount):
+            self.compensation += (self.sum - new_sum) + amount
+        else:
+            self.compensation += (amount - new_sum) + self.sum
+        self.sum = new_sum
+
+    @property
+    def value(self):
+        return self.sum + self.compensation
+
+
+def recompute_total(products):
+    """Sum of price × quantity over every product (a full O(n) pass)."""
+    if isinstance(products, CompactProductStore):
+        return products.total_value()
+    return math.fsum(product['price'] * product['quantity'] for product in products.values())
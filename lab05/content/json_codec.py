@@ -0,0 +1,760 @@
+"""
+JSON Codec - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+One place for every JSON load/save in this lab's scripts.
+
+The standard library `json` module is always available, but faster
+third-party libraries exist. This module picks the fastest one that is
+installed and falls back to `json` otherwise, so the rest of the code
+never has to care:
+
+    import json_codec
+
+    with open("students.json", "rb") as f:
+        data = json_codec.load(f)
+
+    with open("out.json", "w") as f:
+        json_codec.dump(data, f, indent=2)
+
+Backends, fastest first:
+- orjson (pip install orjson)
+- stdlib (the built-in json module)
+
+All backends parse to the same Python objects and write JSON that parses
+back to the same values. The exact text can differ slightly: orjson writes
+non-ASCII characters as UTF-8 instead of \\uXXXX escapes. NaN and Infinity
+(which orjson would turn into null) and integers wider than 64 bits are
+written by the stdlib encoder, as NaN / Infinity / all their digits,
+whichever backend is active, and loads() reads them back the same way. Set the environment variable
+JSON_CODEC=stdlib (or call set_backend("stdlib")) to force the built-in
+module.
+
+load_path() adds a binary snapshot cache: the first load of a big JSON
+file writes "<file>.snap" next to it, and later loads read the snapshot
+instead of parsing the JSON again (see the SNAPSHOT CACHE section).
+
+load_cached() keeps parsed files in memory for the whole process, so
+functions that read the same file over and over only parse it once (see
+the DOCUMENT CACHE section).
+"""
+
+import contextlib
+import gc
+import hashlib
+import io
+import itertools
+import json
+import marshal
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+# ==============================================================================
+# BACKENDS
+# ==============================================================================
+def _stdlib_loads(data):
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj, indent=None, sort_keys=False, compact=False, default=None):
+    # One-line output has no spaces after ',' and ':', exactly like orjson
+    separators = (',', ':') if indent is None else None
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys,
+                      separators=separators, default=default)
+
+
+# 19 digits in a row may be an integer outside orjson's 64-bit range, which
+# orjson would silently turn into a float
+_LONG_DIGITS = re.compile(rb'[0-9]{19}')
+_LONG_DIGITS_STR = re.compile(r'[0-9]{19}')
+
+
+def _orjson_loads(data):
+    try:
+        value = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN, Infinity and 1e400 are rejected by orjson but accepted by
+        # the stdlib (and written by dumps), so let the stdlib decide
+        return json.loads(data)
+    digits = _LONG_DIGITS_STR if isinstance(data, str) else _LONG_DIGITS
+    if digits.search(data):
+        return json.loads(data)  # Keeps big integers exact
+    return value
+
+
+def _has_non_finite(obj, default=None):
+    """True if obj contains a NaN or infinite float (at any depth)."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is float:
+            if value != value or value in (math.inf, -math.inf):
+                return True
+        elif kind is dict:
+            stack.extend(value.values())
+        elif kind in (list, tuple):
+            stack.extend(value)
+        elif kind not in (str, int, bool, type(None)) and default is not None:
+            try:
+                stack.append(default(value))  # What orjson would have written
+            except TypeError:
+                pass
+    return False
+
+
+def _orjson_dumps(obj, indent=None, sort_keys=False, compact=False, default=None):
+    if indent not in (None, 2):
+        # orjson only knows indent=2
+        return _stdlib_dumps(obj, indent, sort_keys, compact, default)
+    option = orjson.OPT_NON_STR_KEYS
+    if indent == 2:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        data = orjson.dumps(obj, default=default, option=option)
+    except orjson.JSONEncodeError:
+        # e.g. integers larger than 64 bits: the stdlib handles those
+        return _stdlib_dumps(obj, indent, sort_keys, compact, default)
+    if b"null" in data and _has_non_finite(obj, default):
+        # orjson writes NaN and Infinity as null, which changes the data
+        return _stdlib_dumps(obj, indent, sort_keys, compact, default)
+    return data.decode('utf-8')
+
+
+_BACKENDS = {"stdlib": (_stdlib_loads, _stdlib_dumps)}
+if orjson is not None:
+    _BACKENDS["orjson"] = (_orjson_loads, _orjson_dumps)
+
+_PREFERENCE = ["orjson", "stdlib"]
+_active = None
+
+
+def available_backends():
+    """Names of the backends installed on this machine, fastest first."""
+    return [name for name in _PREFERENCE if name in _BACKENDS]
+
+
+def set_backend(name=None):
+    """
+    Choose the backend used by loads/dumps/load/dump.
+
+    Args:
+        name (str): "orjson" or "stdlib"; None picks the fastest installed
+                    (or the JSON_CODEC environment variable, if set)
+
+    Returns:
+        str: Name of the backend now in use
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global _active
+    if name is None:
+        name = os.getenv("JSON_CODEC") or available_backends()[0]
+    if name not in _BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available; "
+                         f"installed: {available_backends()}")
+    _active = name
+    return name
+
+
+def backend_name():
+    """Name of the backend currently in use."""
+    return _active
+
+
+# ==============================================================================
+# PUBLIC API (mirrors the json module)
+# ==============================================================================
+def loads(data):
+    """
+    Parse JSON from a str or bytes.
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    return _BACKENDS[_active][0](data)
+
+
+def dumps(obj, indent=None, sort_keys=False, compact=False, default=None):
+    """
+    Serialize obj to a JSON string.
+
+    Args:
+        obj: Any JSON-serializable object
+        indent (int): Pretty-print with this indent (None = one line)
+        sort_keys (bool): Sort dictionary keys
+        compact (bool): Kept for older callers; one-line output never has
+                        spaces after ',' and ':' on any backend
+        default: Function called for objects JSON can't handle
+
+    Read-only views from load_cached() are written like the dicts and
+    lists they wrap.
+
+    Returns:
+        str: JSON text
+    """
+    return _BACKENDS[_active][1](obj, indent, sort_keys, compact, _thaw_views(default))
+
+
+def load(f):
+    """Parse JSON from an open file (text or binary mode)."""
+    return loads(f.read())
+
+
+def dump(obj, f, indent=None, sort_keys=False, compact=False, default=None):
+    """Write obj as JSON to an open file (text or binary mode)."""
+    text = dumps(obj, indent=indent, sort_keys=sort_keys, compact=compact, default=default)
+    if isinstance(f, io.TextIOBase):
+        f.write(text)
+    else:
+        f.write(text.encode('utf-8'))
+
+
+set_backend()
+
+
+# ==============================================================================
+# SNAPSHOT CACHE
+# ==============================================================================
+# Parsing text JSON is the slow part of starting up with a big data file.
+# A snapshot stores the already-parsed data in Python's marshal format
+# (built-in, C speed, only plain data types: no pickle, no custom classes).
+#
+# Snapshot file layout ("<file>.snap"):
+#   8 bytes   magic b"JSNAP01\n"
+#   4 bytes   header length N (unsigned, little endian)
+#   N bytes   header (JSON): source size, mtime_ns and hash of the first
+#             SNAPSHOT_HASH_BYTES bytes, Python version, and a table of
+#             sections [[key, offset, length], ...]
+#   sections  one marshal blob per top-level key of the JSON object
+# The file is memory-mapped on load and only the requested sections are
+# decoded. Any mismatch with the JSON file means the snapshot is ignored and
+# rewritten.
+
+SNAPSHOT_MAGIC = b"JSNAP01\n"
+SNAPSHOT_HASH_BYTES = 64 * 1024
+SNAPSHOT_MIN_SIZE = 64 * 1024  # Smaller files parse fast enough on their own
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector while building a big object tree.
+
+    Creating millions of dicts and lists triggers many collector passes
+    that find nothing to free (parsed JSON has no cycles); pausing it makes
+    loading two to three times faster.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _source_fingerprint(json_file_path):
+    stat = os.stat(json_file_path)
+    with open(json_file_path, 'rb') as f:
+        prefix_hash = hashlib.blake2b(f.read(SNAPSHOT_HASH_BYTES), digest_size=16).hexdigest()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": prefix_hash,
+            "python": list(sys.version_info[:2]), "marshal": marshal.version}
+
+
+def write_snapshot(json_file_path, data, fingerprint=None):
+    """
+    Write the snapshot for json_file_path holding the parsed data.
+
+    Returns:
+        bool: True if written, False if the folder is not writable
+    """
+    if fingerprint is None:
+        fingerprint = _source_fingerprint(json_file_path)
+    if isinstance(data, dict):
+        kind, parts = "object", list(data.items())
+    else:
+        kind, parts = "value", [(None, data)]
+
+    blobs = [marshal.dumps(value) for _, value in parts]
+    # The header holds the section offsets, and the offsets depend on the
+    # header size: reserve room, and grow it until the header fits.
+    reserved = 0
+    while True:
+        offset = len(SNAPSHOT_MAGIC) + 4 + reserved
+        sections = []
+        for (key, _), blob in zip(parts, blobs):
+            sections.append([key, offset, len(blob)])
+            offset += len(blob)
+        header = json.dumps({"source": fingerprint, "kind": kind,
+                             "sections": sections}).encode('utf-8')
+        if len(header) <= reserved:
+            header = header.ljust(reserved)
+            break
+        reserved = len(header) + 16
+
+    snapshot_path = json_file_path + ".snap"
+    try:
+        with open(snapshot_path + ".tmp", 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+        return True
+    except OSError:
+        return False
+
+
+def read_snapshot(json_file_path, keys=None, fingerprint=None):
+    """
+    Read the snapshot of json_file_path if it is still valid.
+
+    Args:
+        json_file_path (str): The JSON file (not the .snap file)
+        keys (list): Only decode these top-level keys (None = all)
+        fingerprint (dict): Current fingerprint, if already computed
+
+    Returns:
+        The parsed data, or None if there is no valid snapshot
+    """
+    if fingerprint is None:
+        fingerprint = _source_fingerprint(json_file_path)
+    try:
+        with open(json_file_path + ".snap", 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                return None
+            start = len(SNAPSHOT_MAGIC) + 4
+            (header_length,) = struct.unpack("<I", mapped[len(SNAPSHOT_MAGIC):start])
+            header = json.loads(mapped[start:start + header_length])
+            if header["source"] != fingerprint:
+                return None
+
+            view = memoryview(mapped)
+            try:
+                values = {}
+                with gc_paused():
+                    for key, offset, length in header["sections"]:
+                        if keys is None or key in keys:
+                            values[key] = marshal.loads(view[offset:offset + length])
+            finally:
+                view.release()
+    except (OSError, ValueError, EOFError, KeyError, TypeError, struct.error):
+        return None
+    return values.get(None) if header["kind"] == "value" else values
+
+
+def load_path(json_file_path, keys=None, snapshot=True):
+    """
+    Load a JSON file, using (and maintaining) its binary snapshot.
+
+    The snapshot is used only while the JSON file's size, modification time
+    and first SNAPSHOT_HASH_BYTES bytes are unchanged; otherwise the JSON is
+    parsed again and a new snapshot is written. Files smaller than
+    SNAPSHOT_MIN_SIZE are always parsed directly.
+
+    Args:
+        json_file_path (str): Path to the JSON file
+        keys (list): For JSON objects, only return these top-level keys
+        snapshot (bool): False to skip the snapshot cache entirely
+
+    Returns:
+        The parsed data (a new copy each call, safe to modify)
+
+    Raises:
+        FileNotFoundError: If the JSON file does not exist
+        json.JSONDecodeError: If the JSON is invalid
+    """
+    use_snapshot = snapshot and os.path.getsize(json_file_path) >= SNAPSHOT_MIN_SIZE
+    fingerprint = None
+    if use_snapshot:
+        fingerprint = _source_fingerprint(json_file_path)
+        data = read_snapshot(json_file_path, keys, fingerprint)
+        if data is not None:
+            return data
+
+    with open(json_file_path, 'rb') as f, gc_paused():
+        data = load(f)
+    if use_snapshot:
+        write_snapshot(json_file_path, data, fingerprint)
+    if keys is not None and isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key in keys}
+    return data
+
+
+def benchmark_snapshot(json_file_path, repeat=3):
+    """
+    Time a cold load (parse JSON, write snapshot) against a warm load
+    (read the snapshot) of the same file.
+
+    Returns:
+        dict: {"parse_s": ..., "cold_s": ..., "warm_s": ...}
+    """
+    snapshot_path = json_file_path + ".snap"
+    parse_times, cold_times, warm_times = [], [], []
+    for _ in range(repeat):
+        parse_times.append(_time(lambda: load_path(json_file_path, snapshot=False)))
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        cold_times.append(_time(lambda: load_path(json_file_path)))
+        warm_times.append(_time(lambda: load_path(json_file_path)))
+
+    results = {"parse_s": min(parse_times), "cold_s": min(cold_times), "warm_s": min(warm_times)}
+    size_mb = os.path.getsize(json_file_path) / 1e6
+    print(f"{os.path.basename(json_file_path)} ({size_mb:.1f} MB, backend {backend_name()}): "
+          f"parse {results['parse_s']:.3f}s, cold {results['cold_s']:.3f}s, "
+          f"warm {results['warm_s']:.3f}s")
+    return results
+
+
+# ==============================================================================
+# DOCUMENT CACHE
+# ==============================================================================
+# load_cached() remembers parsed files in a process-wide LRU cache keyed by
+# (resolved path, mtime_ns, size): editing or replacing the file changes the
+# key, so a stale document is never returned.
+#
+# Every caller shares the same cached objects, so they are handed out as
+# read-only views (ReadOnlyDict / ReadOnlyList). Views wrap the cached data
+# without copying it; nested dicts and lists come back as views too. Call
+# thaw() for a private, mutable copy.
+#
+# Views are Mapping / Sequence objects, not dict / list. json_codec.dumps()
+# writes them like the data they wrap, but the standard library's
+# json.dumps() refuses them: thaw() first. Code that checks
+# isinstance(value, dict) should also accept ReadOnlyDict (and likewise
+# for lists), as the path helpers in json_paths.py do.
+#
+# The budget is counted in bytes of memory used by the parsed objects, which
+# is typically 5-10 times the size of the JSON text. The size of each cached
+# document is estimated after parsing from a sample of its items (walking
+# every object would cost more than the parse). Documents larger than the
+# whole budget are not kept.
+
+DOCUMENT_CACHE_BUDGET = 256 * 1024 * 1024
+PARSED_BYTES_PER_JSON_BYTE = 8   # Guess used before a file has been parsed
+_SIZE_SAMPLE = 64                # Items measured per list or dict
+
+_MISSING = object()
+
+
+class ReadOnlyDict(Mapping):
+    """Read-only view of a cached JSON object."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return _view(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __eq__(self, other):
+        if type(other) in _VIEW_TYPES:
+            other = other._data
+        return self._data == other if isinstance(other, dict) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ReadOnlyDict({self._data!r})"
+
+
+class ReadOnlyList(Sequence):
+    """Read-only view of a cached JSON array."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReadOnlyList(self._data[index])
+        return _view(self._data[index])
+
+    def __iter__(self):
+        return map(_view, self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if type(other) in _VIEW_TYPES:
+            other = other._data
+        if isinstance(other, tuple):
+            other = list(other)
+        return self._data == other if isinstance(other, list) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ReadOnlyList({self._data!r})"
+
+
+_VIEW_TYPES = (ReadOnlyDict, ReadOnlyList)
+
+
+def _view(value):
+    if isinstance(value, dict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable deep copy of a view (other values are copied too)."""
+    if type(value) in _VIEW_TYPES:  # Not isinstance(): ABC checks are slow here
+        value = value._data
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _thaw_views(default):
+    """Wrap a dumps() default function so views serialize like plain data."""
+    def convert(obj):
+        if type(obj) in _VIEW_TYPES:
+            return obj._data  # The wrapped data is plain JSON already
+        if default is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return default(obj)
+    return convert
+
+
+def _estimated_memory(value):
+    """
+    Approximate memory used by a parsed JSON value, in bytes.
+
+    Lists and dicts with more than _SIZE_SAMPLE items are measured on a
+    sample of items, scaled up to the full length.
+    """
+    size = sys.getsizeof(value)
+    if type(value) is dict:
+        if value:
+            items = value.items() if len(value) <= _SIZE_SAMPLE else \
+                itertools.islice(value.items(), _SIZE_SAMPLE)
+            sampled = [sys.getsizeof(key) + _estimated_memory(item) for key, item in items]
+            size += sum(sampled) * len(value) // len(sampled)
+    elif type(value) is list:
+        if value:
+            sampled = value[::max(1, len(value) // _SIZE_SAMPLE)][:_SIZE_SAMPLE]
+            size += sum(map(_estimated_memory, sampled)) * len(value) // len(sampled)
+    return size
+
+
+class _DocumentCache:
+    """Memory-budgeted LRU of parsed documents (one entry per resolved path)."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.entries = OrderedDict()  # path -> (mtime_ns, size, data, memory)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, path, mtime_ns, size):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[:2] == (mtime_ns, size):
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                self._drop(path)  # File changed since it was cached
+            self.misses += 1
+            return _MISSING
+
+    def put(self, path, mtime_ns, size, data):
+        memory = _estimated_memory(data)
+        with self.lock:
+            if path in self.entries:
+                self._drop(path)
+            if memory > self.budget:
+                return
+            self.entries[path] = (mtime_ns, size, data, memory)
+            self.bytes += memory
+            self._shrink(self.budget)
+
+    def _drop(self, path):
+        self.bytes -= self.entries.pop(path)[3]
+
+    def _shrink(self, budget):
+        while self.bytes > budget:
+            path = next(iter(self.entries))
+            self._drop(path)
+            self.evictions += 1
+
+
+_document_cache = _DocumentCache(DOCUMENT_CACHE_BUDGET)
+
+
+def load_cached(json_file_path):
+    """
+    Load a JSON file through the process-wide document cache.
+
+    The file is parsed (via load_path, so the snapshot cache still applies)
+    only when it is not cached yet or has changed on disk since.
+
+    Args:
+        json_file_path (str): Path to the JSON file
+
+    Returns:
+        ReadOnlyDict / ReadOnlyList (or a plain value for scalar JSON).
+        Use thaw() to get a copy you can modify.
+
+    Raises:
+        FileNotFoundError: If the JSON file does not exist
+        json.JSONDecodeError: If the JSON is invalid
+
+    Example:
+        >>> students = load_cached("students.json")["students"]
+        >>> students[0]["name"]
+        'Alice Johnson'
+    """
+    path = os.path.realpath(json_file_path)
+    info = os.stat(path)
+    data = _document_cache.get(path, info.st_mtime_ns, info.st_size)
+    if data is _MISSING:
+        data = load_path(path)
+        _document_cache.put(path, info.st_mtime_ns, info.st_size, data)
+    return _view(data)
+
+
+def fits_document_cache(json_file_path):
+    """
+    True if the file is likely small enough, once parsed, to be kept by
+    load_cached() (or is cached already).
+    """
+    path = os.path.realpath(json_file_path)
+    with _document_cache.lock:
+        if path in _document_cache.entries:
+            return True
+    return os.path.getsize(path) * PARSED_BYTES_PER_JSON_BYTE <= _document_cache.budget
+
+
+def set_document_cache_budget(budget_bytes):
+    """Change the cache budget (bytes of memory), evicting as needed."""
+    with _document_cache.lock:
+        _document_cache.budget = budget_bytes
+        _document_cache._shrink(budget_bytes)
+
+
+def clear_document_cache():
+    """Forget every cached document (counters are kept)."""
+    with _document_cache.lock:
+        _document_cache.entries.clear()
+        _document_cache.bytes = 0
+
+
+def document_cache_stats():
+    """
+    Return the cache counters.
+
+    Returns:
+        dict: {"hits", "misses", "evictions", "entries", "bytes", "budget"}
+              ("bytes" is the estimated memory of the cached documents)
+    """
+    cache = _document_cache
+    with cache.lock:
+        return {"hits": cache.hits, "misses": cache.misses, "evictions": cache.evictions,
+                "entries": len(cache.entries), "bytes": cache.bytes, "budget": cache.budget}
+
+
+# ==============================================================================
+# MICROBENCHMARK
+# ==============================================================================
+def benchmark(data_dir=None, scale=2000, repeat=3):
+    """
+    Compare backends on the lab05/data fixtures, scaled up.
+
+    Each fixture's top-level lists are repeated `scale` times so the
+    documents are big enough to time. Reports MB/s for parsing and for
+    pretty (indent=2) and one-line serialization.
+
+    Args:
+        data_dir (str): Folder with the fixtures (default: ../data)
+        scale (int): How many times to repeat each list
+        repeat (int): Best of this many runs is reported
+
+    Returns:
+        dict: {backend: {"loads": MB/s, "dumps": MB/s, "dumps_indent": MB/s}}
+    """
+    if data_dir is None:
+        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+    documents = []
+    for name in sorted(os.listdir(data_dir)):
+        if not name.endswith(".json") or name.startswith("broken"):
+            continue
+        with open(os.path.join(data_dir, name), 'r') as f:
+            data = json.load(f)
+        scaled = {key: value * scale if isinstance(value, list) else value
+                  for key, value in data.items()}
+        documents.append(json.dumps(scaled, indent=2).encode('utf-8'))
+    total_mb = sum(len(document) for document in documents) / 1e6
+
+    previous = backend_name()
+    results = {}
+    try:
+        for name in available_backends():
+            set_backend(name)
+            parsed = [loads(document) for document in documents]
+            timings = {}
+            for label, work in (
+                    ("loads", lambda: [loads(document) for document in documents]),
+                    ("dumps", lambda: [dumps(value) for value in parsed]),
+                    ("dumps_indent", lambda: [dumps(value, indent=2) for value in parsed])):
+                best = min(_time(work) for _ in range(repeat))
+                timings[label] = total_mb / best
+            results[name] = timings
+    finally:
+        set_backend(previous)
+
+    print(f"Fixtures x{scale}: {total_mb:.1f} MB of JSON")
+    print(f"{'backend':8} {'loads MB/s':>12} {'dumps MB/s':>12} {'indent=2 MB/s':>14}")
+    for name, timings in results.items():
+        print(f"{name:8} {timings['loads']:12.1f} {timings['dumps']:12.1f} "
+              f"{timings['dumps_indent']:14.1f}")
+    return results
+
+
+def _time(work):
+    start = time.perf_counter()
+    work()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    benchmark()
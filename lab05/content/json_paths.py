@@ -0,0 +1,267 @@
+"""
+JSON Paths - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Reading values deep inside parsed JSON by path, as in Problem 7 of
+04_JSON_Practice_Problems.py:
+
+    import json_paths
+
+    path = json_paths.compile_json_path("weather[0].description")
+    path.get(data)                  # 'light rain', or None if missing
+
+    columns = json_paths.project_columns(records, ["name", "address.city"])
+    columns["address.city"]         # one city per record
+
+A path is parsed once and cached (COMPILED PATHS). project_columns pulls
+several paths out of every record in one pass (COLUMNAR PROJECTION).
+"""
+
+import functools
+import json
+import math
+import re
+from array import array
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+
+
+# ==============================================================================
+# COMPILED PATHS
+# ==============================================================================
+# Paths are parsed once into a list of steps and cached, because programs
+# tend to use a handful of paths millions of times. Supported syntax:
+#   user.address.city        keys separated by dots
+#   weather[0].description   list index (negative counts from the end)
+#   movies[*].actors         wildcard: every item of a list (or dict value)
+#   stats["avg.rating"]      quoted key, for keys containing dots or brackets
+
+_PATH_TOKEN = re.compile(r'\.?([^.\[\]]+)|\[(-?\d+|\*)\]|\["((?:[^"\\]|\\.)*)"\]')
+_PATH_CACHE_SIZE = 1024
+
+_KEY, _INDEX, _WILDCARD = "key", "index", "wildcard"
+_MISSING = object()
+# Objects and arrays, including the read-only views json_codec.load_cached()
+# hands out (concrete classes, so the common dict/list case stays fast)
+_DICT_TYPES = (dict, json_codec.ReadOnlyDict)
+_LIST_TYPES = (list, json_codec.ReadOnlyList)
+
+
+class JsonPath:
+    """
+    A compiled path (see compile_json_path).
+
+    get(data) returns the value at the path, or None if it doesn't exist.
+    Paths with a wildcard return a list with one entry per match.
+    """
+
+    def __init__(self, path, steps):
+        self.path = path
+        self.steps = steps
+        self.has_wildcard = any(kind == _WILDCARD for kind, _ in steps)
+
+    def __repr__(self):
+        return f"JsonPath({self.path!r})"
+
+    def _walk(self, value, start):
+        """Follow the steps from position start; yields every match."""
+        steps = self.steps
+        for position in range(start, len(steps)):
+            kind, arg = steps[position]
+            if kind == _KEY:
+                if isinstance(value, _DICT_TYPES):
+                    value = value.get(arg, _MISSING)
+                elif isinstance(value, _LIST_TYPES) and arg.isdigit() and int(arg) < len(value):
+                    value = value[int(arg)]  # "items.0" also works on lists
+                else:
+                    return
+            elif kind == _INDEX:
+                if not isinstance(value, _LIST_TYPES) or not -len(value) <= arg < len(value):
+                    return
+                value = value[arg]
+            else:
+                if isinstance(value, _DICT_TYPES):
+                    items = value.values()
+                elif isinstance(value, _LIST_TYPES):
+                    items = value
+                else:
+                    return
+                for item in items:
+                    yield from self._walk(item, position + 1)
+                return
+            if value is _MISSING:
+                return
+        yield value
+
+    def get(self, data):
+        if not self.steps:
+            return None  # An empty path names no field
+        if self.has_wildcard:
+            return list(self._walk(data, 0))
+        # Fast path: plain dict lookups; anything unusual goes to _walk
+        value = data
+        for position, (kind, arg) in enumerate(self.steps):
+            if kind == _INDEX and not isinstance(value, _LIST_TYPES):
+                return None  # Don't index into strings
+            try:
+                value = value[arg]
+            except KeyError:
+                return None
+            except (TypeError, IndexError):
+                return next(self._walk(value, position), None)
+        return value
+
+    def get_many(self, documents):
+        """Evaluate this path on every document; returns a list of results."""
+        get = self.get
+        return [get(document) for document in documents]
+
+
+@functools.lru_cache(maxsize=_PATH_CACHE_SIZE)
+def compile_json_path(field_path):
+    """
+    Parse a path string once. Results are kept in an LRU cache keyed by the
+    path string, so repeated calls with the same path are free.
+
+    Args:
+        field_path (str): Path such as "weather[0].description"
+
+    Returns:
+        JsonPath: Compiled path with get() and get_many()
+
+    Raises:
+        ValueError: If the path syntax is invalid
+    """
+    steps = []
+    position = 0
+    while position < len(field_path):
+        m = _PATH_TOKEN.match(field_path, position)
+        if m is None or (m.group(1) is not None and position > 0 and
+                         not m.group(0).startswith(".")):
+            raise ValueError(f"Invalid path {field_path!r} at position {position}")
+        key, index, quoted = m.groups()
+        if key is not None:
+            steps.append((_WILDCARD, None) if key == "*" else (_KEY, key))
+        elif index == "*":
+            steps.append((_WILDCARD, None))
+        elif index is not None:
+            steps.append((_INDEX, int(index)))
+        else:
+            steps.append((_KEY, json.loads(f'"{quoted}"')))
+        position = m.end()
+    return JsonPath(field_path, tuple(steps))
+
+
+# ==============================================================================
+# COLUMNAR PROJECTION
+# ==============================================================================
+# Pull several paths out of every record in ONE pass. Paths that share a
+# prefix ("enrollment.capacity", "enrollment.enrolled") are merged into a
+# trie, so "enrollment" is looked up once per record instead of once per path.
+
+class _PathTrieNode:
+    def __init__(self):
+        self.children = {}  # (kind, arg) step -> _PathTrieNode
+        self.outputs = []   # (column number, JsonPath for the rest or None)
+
+
+def _build_path_trie(paths):
+    root = _PathTrieNode()
+    for column, path in enumerate(paths):
+        steps = compile_json_path(path).steps
+        node = root
+        for position, step in enumerate(steps):
+            if step[0] == _WILDCARD:
+                # Wildcards fan out; the rest of the path is walked per match
+                rest = JsonPath(path, steps[position:])
+                node.outputs.append((column, rest))
+                break
+            node = node.children.setdefault(step, _PathTrieNode())
+        else:
+            node.outputs.append((column, None))
+    return root
+
+
+def _path_step(value, step):
+    """Apply one key/index step to any value; _MISSING if it doesn't exist."""
+    kind, arg = step
+    if kind == _KEY and isinstance(value, _DICT_TYPES):
+        return value.get(arg, _MISSING)
+    if isinstance(value, _LIST_TYPES):
+        if kind == _INDEX and -len(value) <= arg < len(value):
+            return value[arg]
+        if kind == _KEY and arg.isdigit() and int(arg) < len(value):
+            return value[int(arg)]
+    return _MISSING
+
+
+def _project_node(node, value, row):
+    """Fill row (one slot per column) with the values under this trie node."""
+    for column, rest in node.outputs:
+        row[column] = value if rest is None else list(rest._walk(value, 0))
+    is_dict = type(value) is dict
+    for step, child in node.children.items():
+        if is_dict and step[0] == _KEY:
+            child_value = value.get(step[1], _MISSING)  # The common case, inlined
+        else:
+            child_value = _path_step(value, step)
+        if child_value is not _MISSING:
+            if child.children:
+                _project_node(child, child_value, row)
+            else:  # A leaf: no call needed
+                for column, rest in child.outputs:
+                    row[column] = child_value if rest is None else list(rest._walk(child_value, 0))
+
+
+def _to_typed_column(values):
+    """array('q') for ints, array('d') for numbers (None -> nan), else list."""
+    kinds = {type(value) for value in values}
+    if kinds <= {int}:
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values  # Some integer needs more than 64 bits; keep it exact
+    if kinds <= {int, float, type(None)} and kinds & {int, float}:
+        return array('d', [math.nan if value is None else value for value in values])
+    return values
+
+
+def project_columns(records, paths, typed=True):
+    """
+    Extract several paths from every record in a single pass.
+
+    Args:
+        records: Iterable of parsed records (a list, or
+                 record_files.iter_records(...))
+        paths (list): Paths, same syntax as compile_json_path
+        typed (bool): Store all-integer columns as array('q') and numeric
+                      columns as array('d') (missing values become nan).
+                      Integers too big for 64 bits keep the column a list.
+                      Both convert to NumPy without copying
+                      (numpy.frombuffer or numpy.asarray).
+
+    Returns:
+        dict: {path: column}, each column holding one value per record
+              (None where the path doesn't exist)
+
+    Example:
+        >>> records = record_files.iter_records("courses.json")
+        >>> columns = project_columns(records, ["enrollment.capacity",
+        ...                                     "enrollment.enrolled", "instructor.name"])
+        >>> sum(columns["enrollment.enrolled"]) / sum(columns["enrollment.capacity"])
+    """
+    paths = list(paths)
+    columns = [[] for _ in paths]
+    if paths:
+        trie = _build_path_trie(paths)
+        appends = [column.append for column in columns]
+        empty_row = [None] * len(paths)
+        for record in records:
+            row = empty_row.copy()
+            _project_node(trie, record, row)
+            for append, value in zip(appends, row):
+                append(value)
+
+    if typed:
+        columns = [_to_typed_column(column) for column in columns]
+    return dict(zip(paths, columns))
@@ -0,0 +1,547 @@
+"""
+Layered Config - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Configuration built from several JSON files or dicts ("layers"): a base
+config plus environment, tenant and user overrides, where a higher layer
+wins wherever it sets a value (Problem 5 in 04_JSON_Practice_Problems.py
+validates one such config):
+
+    import layered_config
+
+    config = layered_config.LayeredConfig.from_files(["base.json", "dev.json"])
+    config.get("database.port")
+
+    with layered_config.ConfigWatcher(["base.json", "dev.json"], rules) as watcher:
+        watcher.config.get("database.port")    # Always the latest valid config
+
+- VALIDATION RULES: run (path, check) rules over a config
+- LAYERED CONFIG: look values up through the layers without merging copies
+- HOT RELOAD: ConfigWatcher reloads and revalidates files when they change
+"""
+
+import ctypes
+import os
+import select
+import sys
+import threading
+import time
+from collections.abc import Mapping
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+
+_MISSING = object()  # No value at this path
+_SUBTREE = object()  # Memo marker: the path resolves to a merged object
+_BLOCKED = object()  # A plain value sits above the path in this layer
+
+
+# ==============================================================================
+# VALIDATION RULES
+# ==============================================================================
+# Rules are (path, check) pairs, e.g. (("database", "port"), check_port).
+# check(path_name, value) looks at the value at one path and returns a list
+# of error messages, so a watcher can re-run just the rules whose part of
+# the document changed.
+
+def _run_config_rules(get, rules, indexes=None):
+    """
+    Run the rules at the given indexes (default: all) and return
+    {rule index: [errors]}. get(path) returns the value or _MISSING.
+    A rule is skipped when one of its parents is missing or not an object;
+    the parent's own rule reports that.
+    """
+    results = {}
+    for index in range(len(rules)) if indexes is None else indexes:
+        path, check = rules[index]
+        if any(not isinstance(get(path[:depth]), Mapping) for depth in range(1, len(path))):
+            results[index] = []
+            continue
+        value = get(path)
+        path_name = ".".join(path)
+        if value is _MISSING:
+            results[index] = [f"Missing required field: {path_name}"]
+        else:
+            results[index] = check(path_name, value)
+    return results
+
+
+def _rule_errors_list(rule_errors):
+    return [error for index in sorted(rule_errors) for error in rule_errors[index]]
+
+
+def check_config(config, rules):
+    """
+    Run every rule on a plain config dict.
+
+    Args:
+        config (dict): Parsed configuration
+        rules (list): (path, check) rules
+
+    Returns:
+        list: Error messages in rule order (empty if the config is valid)
+    """
+    def get(path):
+        value = _layer_value(config, path)
+        return _MISSING if value is _BLOCKED else value
+
+    return _rule_errors_list(_run_config_rules(get, rules))
+
+
+# ==============================================================================
+# LAYERED CONFIG
+# ==============================================================================
+# deep_merge() (see 03_JSON_Data_Processing.md) copies every level on every
+# merge. LayeredConfig keeps the layers as they are and answers each lookup
+# by walking the path down the layers, top (highest precedence) first:
+#   - the first layer holding a non-object value at the path wins
+#   - if the top layers hold objects there, the answer is a ConfigView that
+#     merges them lazily (nothing is copied; unchanged subtrees are shared)
+# Answers are memoized per path in a trie. Changing a layer diffs it against
+# its old contents and forgets only the memo entries on the changed paths
+# (their ancestors and descendants), so a lookup costs O(depth x layers) no
+# matter how big the configuration is.
+
+def _config_path(path):
+    """Accept "database.port", ("database", "port") or "" (the root)."""
+    if isinstance(path, str):
+        return tuple(path.split(".")) if path else ()
+    return tuple(path)
+
+
+def _layer_value(layer, path):
+    """Value at path in one layer, _MISSING if absent or _BLOCKED."""
+    value = layer
+    for key in path:
+        if not isinstance(value, dict):
+            return _BLOCKED
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _changed_config_paths(old, new, prefix=()):
+    """Yield the paths where two versions of a layer differ."""
+    old_is_dict = isinstance(old, dict) or old is _MISSING
+    new_is_dict = isinstance(new, dict) or new is _MISSING
+    if old_is_dict and new_is_dict:
+        old = {} if old is _MISSING else old
+        new = {} if new is _MISSING else new
+        if not old and not new and prefix:
+            yield prefix  # An empty object appeared or disappeared
+        for key in old.keys() | new.keys():
+            yield from _changed_config_paths(old.get(key, _MISSING), new.get(key, _MISSING),
+                                             prefix + (key,))
+    elif type(old) is not type(new) or old != new:
+        yield prefix
+
+
+class ConfigView(Mapping):
+    """Read-only, lazily merged view of one object in a LayeredConfig."""
+
+    __slots__ = ("_config", "_path")
+
+    def __init__(self, config, path):
+        self._config = config
+        self._path = path
+
+    def __getitem__(self, key):
+        value = self._config._lookup(self._path + (key,))
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        keys = {}
+        for layer in self._config._contributing_layers(self._path):
+            keys.update(dict.fromkeys(layer))
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ConfigView({'.'.join(self._path)!r}, {self.to_dict()!r})"
+
+    def to_dict(self):
+        """Return a plain (deep-copied) dict of the merged values."""
+        return json_codec.thaw({key: value.to_dict() if isinstance(value, ConfigView) else value
+                                for key, value in self.items()})
+
+
+class LayeredConfig:
+    """
+    A stack of configuration layers resolved on demand.
+
+    Layers are plain dicts, lowest precedence first. They are not copied, so
+    change them only through set_layer(), set_value() or remove_layer().
+
+    Example:
+        >>> config = LayeredConfig([("base", base), ("env", env_overrides)])
+        >>> config.get("database.host")
+        'dev-db.example.com'
+        >>> config.set_value("env", "database.port", 6543)
+        >>> config["database"]["port"]
+        6543
+    """
+
+    def __init__(self, layers=()):
+        self._names = []
+        self._layers = {}
+        self._memo = [_MISSING, {}]  # Trie node: [memoized value, children]
+        self._generation = 0
+        self._lock = threading.Lock()
+        for name, data in layers:
+            self.set_layer(name, data)
+
+    @classmethod
+    def from_files(cls, json_file_paths):
+        """Build a config from JSON files, one layer per file (named by path)."""
+        return cls((path, json_codec.load_path(path)) for path in json_file_paths)
+
+    @property
+    def layer_names(self):
+        return list(self._names)
+
+    def layer(self, name):
+        return self._layers[name]
+
+    # -- changing layers -------------------------------------------------------
+    def set_layer(self, name, data):
+        """Replace a layer (or add it on top if the name is new)."""
+        if not isinstance(data, dict):
+            raise TypeError("a configuration layer must be a dict")
+        with self._lock:
+            old = self._layers.get(name, _MISSING)
+            if old is _MISSING:
+                self._names.append(name)
+            self._layers[name] = data
+            self._invalidate(_changed_config_paths(old, data))
+
+    def remove_layer(self, name):
+        with self._lock:
+            old = self._layers.pop(name)
+            self._names.remove(name)
+            self._invalidate(_changed_config_paths(old, _MISSING))
+
+    def set_value(self, name, path, value):
+        """Set one value inside a layer, creating objects along the path."""
+        path = _config_path(path)
+        if not path:
+            raise ValueError("path must not be empty")
+        with self._lock:
+            target = self._layers[name]
+            for key in path[:-1]:
+                if not isinstance(target.get(key), dict):
+                    target[key] = {}
+                target = target[key]
+            old = target.get(path[-1], _MISSING)
+            target[path[-1]] = value
+            self._invalidate(_changed_config_paths(old, value, path))
+
+    def _invalidate(self, changed_paths):
+        """Forget memoized answers along each changed path (lock held)."""
+        self._generation += 1
+        for path in changed_paths:
+            node = self._memo
+            node[0] = _MISSING
+            for key in path[:-1]:
+                node = node[1].get(key)
+                if node is None:
+                    break
+                node[0] = _MISSING
+            else:
+                if path:
+                    node[1].pop(path[-1], None)  # Drops every descendant too
+                else:
+                    node[1].clear()
+
+    # -- lookups ---------------------------------------------------------------
+    def _contributing_layers(self, path):
+        """The objects at path, highest precedence first, down to a blocker."""
+        found = []
+        for name in reversed(self._names):
+            value = _layer_value(self._layers[name], path)
+            if value is _MISSING:
+                continue
+            if not isinstance(value, dict):
+                break  # A plain value hides objects in lower layers
+            found.append(value)
+        found.reverse()
+        return found
+
+    def _resolve(self, path):
+        if not path:
+            return _SUBTREE  # The root is always an object
+        for name in reversed(self._names):
+            value = _layer_value(self._layers[name], path)
+            if value is _BLOCKED:
+                return _MISSING
+            if value is not _MISSING:
+                return _SUBTREE if isinstance(value, dict) else value
+        return _MISSING
+
+    def _lookup(self, path):
+        node = self._memo
+        for key in path:
+            child = node[1].get(key)
+            if child is None:
+                break
+            node = child
+        else:
+            if node[0] is not _MISSING:
+                return self._present(node[0], path)
+
+        generation = self._generation
+        value = self._resolve(path)
+        with self._lock:
+            if generation == self._generation:  # No layer changed meanwhile
+                node = self._memo
+                for key in path:
+                    node = node[1].setdefault(key, [_MISSING, {}])
+                node[0] = value
+        return self._present(value, path)
+
+    def _present(self, value, path):
+        if value is _SUBTREE:
+            return ConfigView(self, path)
+        if isinstance(value, list):
+            return json_codec.ReadOnlyList(value)
+        return value
+
+    def get(self, path, default=None):
+        """Return the value at "a.b.c" (or a key tuple), or default."""
+        value = self._lookup(_config_path(path))
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = self._lookup(_config_path(key))
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._lookup(_config_path(key)) is not _MISSING
+
+    def to_dict(self):
+        """Return the fully merged configuration as a plain dict."""
+        return ConfigView(self, ()).to_dict()
+
+
+# ==============================================================================
+# HOT RELOAD
+# ==============================================================================
+# ConfigWatcher keeps a validated LayeredConfig built from config
+# files and reloads it when a file changes. Changes are noticed with Linux
+# inotify (no extra packages, via ctypes), or by polling the files' size and
+# modification time where inotify is not available.
+#
+# On a change, only the changed files are parsed; each is diffed against the
+# layer it replaces, and only the rules whose path lies on a changed path are
+# re-run (editing database.port re-runs the database and database.port rules,
+# nothing else). The new config is built on the side and swapped in with one
+# assignment, so readers never wait and never see a half-applied reload.
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_DELETE = 0x200
+CONFIG_RELOAD_DEBOUNCE = 0.05  # Seconds to let a burst of file events settle
+
+
+def _open_inotify(directories):
+    """Return an inotify file descriptor watching the directories, or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_DELETE
+    for directory in directories:
+        # Watch directories, not files: editors often save by renaming
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+def _config_file_signature(json_file_path):
+    try:
+        stat = os.stat(json_file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _paths_overlap(a, b):
+    """True if one path is a prefix of the other (or they are equal)."""
+    return a[:len(b)] == b[:len(a)]
+
+
+class ConfigWatcher:
+    """
+    Keep a LayeredConfig in sync with its JSON files.
+
+    Files are layered in order (later files override earlier ones). A reload
+    is rejected, and the current config kept, if the file is missing or
+    invalid JSON, or if validation finds an error the current config does
+    not already have.
+
+    Args:
+        json_file_paths (list): Config files, lowest precedence first
+        rules (list): (path, check) validation rules, such as CONFIG_RULES
+                      in 04_JSON_Practice_Problems.py (default: none, so
+                      any JSON object is accepted)
+        poll_interval (float): Seconds between checks when polling
+        on_reload (callable): Called with the new LayeredConfig
+        on_error (callable): Called with the errors of a rejected reload
+
+    Example:
+        >>> with ConfigWatcher(["config_base.json", "config_override.json"],
+        ...                    rules) as watcher:
+        ...     port = watcher.config.get("database.port")
+    """
+
+    def __init__(self, json_file_paths, rules=(), poll_interval=1.0,
+                 on_reload=None, on_error=None):
+        self.paths = list(json_file_paths)
+        self.rules = list(rules)
+        self.poll_interval = poll_interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.mode = None  # "inotify" or "polling" once started
+        self.last_errors = []
+        self.stats = {"reloads": 0, "rejected": 0, "rules_run": len(self.rules)}
+        self._signatures = {path: _config_file_signature(path) for path in self.paths}
+        self._rejected_signatures = None  # Files as they were at the last rejection
+        self._config = LayeredConfig((path, json_codec.load_path(path, snapshot=False))
+                                     for path in self.paths)
+        self._rule_errors = _run_config_rules(self._get_from(self._config), self.rules)
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _get_from(config):
+        return lambda path: config.get(path, _MISSING)
+
+    @property
+    def config(self):
+        """The current validated LayeredConfig (never blocks)."""
+        return self._config
+
+    @property
+    def errors(self):
+        """Validation errors of the current config."""
+        return _rule_errors_list(self._rule_errors)
+
+    def check(self):
+        """
+        Reload any changed files now.
+
+        Returns:
+            bool: True if a new config was swapped in
+        """
+        with self._reload_lock:
+            # The signatures are only committed once the new config is
+            # swapped in, so after a rejection every changed file (not just
+            # the broken one) is read again on the next check
+            signatures = {path: _config_file_signature(path) for path in self.paths}
+            if signatures == self._signatures or signatures == self._rejected_signatures:
+                return False  # Nothing new since the last reload or rejection
+            new_layers = {}
+            problems = []
+            for path in self.paths:
+                if signatures[path] == self._signatures[path]:
+                    continue
+                try:
+                    data = json_codec.load_path(path, snapshot=False)
+                except (OSError, ValueError) as e:
+                    problems.append(f"{path}: {e}")
+                    continue
+                if not isinstance(data, dict):
+                    problems.append(f"{path}: configuration must be a JSON object")
+                    continue
+                new_layers[path] = data
+            if problems:
+                return self._reject(problems, signatures)
+
+            old = self._config
+            candidate = LayeredConfig(
+                (path, new_layers[path] if path in new_layers else old.layer(path))
+                for path in self.paths)
+            changed = [changed_path for path, data in new_layers.items()
+                       for changed_path in _changed_config_paths(old.layer(path), data)]
+            affected = [index for index, (rule_path, _) in enumerate(self.rules)
+                        if any(_paths_overlap(rule_path, path) for path in changed)]
+            rule_errors = dict(self._rule_errors)
+            rule_errors.update(_run_config_rules(self._get_from(candidate), self.rules, affected))
+            self.stats["rules_run"] += len(affected)
+
+            new_errors = set(_rule_errors_list(rule_errors)) - set(self.errors)
+            if new_errors:
+                return self._reject(sorted(new_errors), signatures)
+            self._config = candidate  # The swap: one reference assignment
+            self._rule_errors = rule_errors
+            self._signatures = signatures
+            self._rejected_signatures = None
+            self.last_errors = []
+            self.stats["reloads"] += 1
+        if self.on_reload:
+            self.on_reload(candidate)
+        return True
+
+    def _reject(self, errors, signatures):
+        self._rejected_signatures = signatures
+        self.last_errors = errors
+        self.stats["rejected"] += 1
+        if self.on_error:
+            self.on_error(errors)
+        return False
+
+    def start(self):
+        """Watch the files in a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _watch(self):
+        directories = {os.path.dirname(os.path.abspath(path)) for path in self.paths}
+        fd = _open_inotify(directories)
+        if fd is None:
+            self.mode = "polling"
+            while not self._stop.wait(self.poll_interval):
+                self.check()
+            return
+        self.mode = "inotify"
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                time.sleep(CONFIG_RELOAD_DEBOUNCE)
+                try:
+                    while os.read(fd, 64 * 1024):
+                        pass  # Drain; check() compares signatures itself
+                except BlockingIOError:
+                    pass
+                self.check()
+        finally:
+            os.close(fd)
@@ -0,0 +1,750 @@
+"""
+Record Files - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Tools for files shaped like {"records": [{...}, {...}, ...]} that may be
+far bigger than memory:
+
+    import record_files
+
+    for record in record_files.iter_records("records.json"):
+        print(record["name"])
+
+    record_files.merge_json_files_many(["jan.json", "feb.json"], "all.json")
+    record_files.diff_record_files("old.json", "new.json", "sync.patch.jsonl")
+    record_files.apply_record_patch("copy_of_old.json", "sync.patch.jsonl")
+
+- iter_records() streams one record at a time (STREAMING READS)
+- write_records_streaming() writes them back the same way
+- merge_json_files_many() merges files by "id" with an external sort, so
+  memory stays bounded however big the inputs are (EXTERNAL MERGE)
+- diff_record_files() / apply_record_patch() ship only what changed
+  between two versions of a file (DIFF AND PATCH)
+- map_in_order() spreads work over a process pool (PARALLEL MAP)
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import heapq
+import json
+import os
+import re
+import tempfile
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+
+
+# ==============================================================================
+# STREAMING READS
+# ==============================================================================
+# json.load() reads the whole document into memory before we can look at a
+# single record. For multi-GB record dumps we instead scan the file in chunks
+# and decode ONE element of the records array at a time.
+
+_JSON_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_JSON_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+# A complete string, a lone quote (string cut off at the end of the buffer),
+# or a bracket. Strings are matched whole so brackets inside them are ignored.
+_JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|"|[{}\[\]]', re.DOTALL)
+_JSON_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class JsonArrayScanner:
+    """
+    Incremental scanner for a top-level array inside a JSON object file.
+
+    Only the bytes of the current element are kept in memory, so memory use
+    stays flat no matter how big the file is. Each element is returned as raw
+    bytes together with its byte offset in the file.
+    """
+
+    def __init__(self, f, chunk_size=STREAM_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.base = 0   # file offset of buf[0]
+        self.pos = 0    # current position inside buf
+        self.eof = False
+
+    def _fill(self):
+        """Read another chunk, dropping consumed bytes. False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.base += self.pos
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next significant byte (b"" at EOF)."""
+        while True:
+            self.pos = _JSON_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            if not self._fill():
+                return b""
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at byte {self.base + self.pos}, found {found!r}")
+        self.pos += 1
+
+    def _value_end(self):
+        """Return the buffer index just past the JSON value starting at pos."""
+        first = self._peek()
+        if not first:
+            raise ValueError("Unexpected end of JSON data")
+
+        if first in (b"{", b"["):
+            depth = 0
+            i = self.pos
+            while True:
+                m = _JSON_TOKEN.search(self.buf, i)
+                if m is None or m.group() == b'"':
+                    # Value continues past the buffer: read more and resume
+                    resume = len(self.buf) if m is None else m.start()
+                    offset = resume - self.pos
+                    if not self._fill():
+                        raise ValueError("Unexpected end of JSON data")
+                    i = self.pos + offset
+                    continue
+                token = m.group()
+                i = m.end()
+                if token in (b"{", b"["):
+                    depth += 1
+                elif token in (b"}", b"]"):
+                    depth -= 1
+                    if depth == 0:
+                        return i
+
+        if first == b'"':
+            while True:
+                m = _JSON_STRING.match(self.buf, self.pos)
+                if m:
+                    return m.end()
+                if not self._fill():
+                    raise ValueError("Unterminated string in JSON data")
+
+        # Number, true, false or null
+        while True:
+            m = _JSON_SCALAR_END.search(self.buf, self.pos)
+            if m:
+                return m.start()
+            if not self._fill():
+                return len(self.buf)
+
+    def _take_value(self):
+        """Consume the next value and return (byte_offset, raw_bytes)."""
+        end = self._value_end()
+        offset = self.base + self.pos
+        raw = self.buf[self.pos:end]
+        self.pos = end
+        return offset, raw
+
+    def _next_separator(self, closing):
+        """Consume a ',' (returns True) or the closing bracket (returns False)."""
+        sep = self._peek()
+        self.pos += 1
+        if sep == closing:
+            return False
+        if sep != b",":
+            raise ValueError(f"Expected ',' or {closing!r} at byte {self.base + self.pos - 1}")
+        return True
+
+    def iter_array(self, array_key=None):
+        """
+        Yield (byte_offset, raw_bytes) for each element of the array stored
+        under array_key in the top-level object. If array_key is None, the
+        first top-level array is used.
+        """
+        self._expect(b"{")
+        if self._peek() == b"}":
+            return
+        while True:
+            key = json.loads(self._take_value()[1])
+            self._expect(b":")
+            if (array_key is None and self._peek() == b"[") or key == array_key:
+                self._expect(b"[")
+                if self._peek() == b"]":
+                    return
+                while True:
+                    yield self._take_value()
+                    if not self._next_separator(b"]"):
+                        return
+            self._take_value()  # Skip values we are not interested in
+            if not self._next_separator(b"}"):
+                return
+
+
+def iter_records(json_file_path, array_key=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream records from a JSON file one at a time (generator).
+
+    Works on files shaped like {"records": [{...}, {...}, ...]} without
+    loading the whole document, so memory stays flat for huge files and the
+    first record is available right away.
+
+    Args:
+        json_file_path (str): Path to JSON file
+        array_key (str): Name of the array to stream. None means the first
+                         top-level array ("records", "students", ...)
+        chunk_size (int): Bytes read from disk at a time
+
+    Yields:
+        dict: One parsed record at a time
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the JSON is malformed (json.JSONDecodeError included)
+
+    Example:
+        >>> for record in iter_records("records.json"):
+        ...     print(record["name"])
+    """
+    with open(json_file_path, 'rb') as f:
+        for _, raw in JsonArrayScanner(f, chunk_size).iter_array(array_key):
+            yield json_codec.loads(raw)
+
+
+def iter_records_cached(json_file_path, array_key=None, cache=True):
+    """
+    Like iter_records(), but served from json_codec's document cache when
+    cache is True and the file fits in it, so repeated calls do not parse
+    the file again. Records then come back as read-only views. Otherwise
+    (or for files too big for the cache) the records are streamed.
+    """
+    if not cache or not json_codec.fits_document_cache(json_file_path):
+        return iter_records(json_file_path, array_key)
+    document = json_codec.load_cached(json_file_path)
+    if not isinstance(document, json_codec.ReadOnlyDict):
+        raise ValueError(f"{json_file_path}: expected a JSON object at the top level")
+    for key, value in document.items():
+        if (array_key is None and isinstance(value, json_codec.ReadOnlyList)) or key == array_key:
+            if not isinstance(value, json_codec.ReadOnlyList):
+                raise ValueError(f"{json_file_path}: {key!r} is not an array")
+            return iter(value)
+    return iter(())
+
+
+# ==============================================================================
+# EXTERNAL MERGE
+# ==============================================================================
+# Holding a merged id map in memory only works while the files fit in RAM.
+# The merge below is an external sort-merge:
+#   1. Read every input as a stream and collect up to max_records_in_memory
+#      records at a time; sort each batch by id and spill it to a temp file
+#      (a "run").
+#   2. Merge all runs with a heap (heapq.merge), which only holds one record
+#      per run in memory. Records with the same id arrive next to each other,
+#      and the one from the latest input file wins.
+# The output is written as it is produced, sorted by id.
+
+MERGE_RUN_SIZE = 100000   # Records sorted in memory per run
+MERGE_FAN_IN = 64         # Runs merged at once (limits open files)
+
+
+def is_number(value):
+    """True for JSON numbers (int or float, but not bool)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _id_sort_key(record_id):
+    """Sort numbers before strings; never compare an int with a str."""
+    if is_number(record_id):
+        return [0, record_id]
+    if isinstance(record_id, str):
+        return [1, record_id]
+    raise ValueError(f"Record id must be a number or string, got {record_id!r}")
+
+
+def _write_run(entries, temp_dir, run_number):
+    """Sort one batch and write it as JSON Lines. Returns the run's path."""
+    entries.sort(key=lambda entry: entry[:3])
+    path = os.path.join(temp_dir, f"run{run_number:06d}.jsonl")
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json_codec.dumps(entry, compact=True))
+            f.write("\n")
+    return path
+
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json_codec.loads(line)
+
+
+def _merge_runs(paths):
+    """Yield entries from several sorted runs in (id, precedence) order."""
+    return heapq.merge(*(_read_run(path) for path in paths), key=lambda entry: entry[:3])
+
+
+def write_records_streaming(output_path, records, indent=2):
+    """
+    Write {"records": [...]} one record at a time.
+
+    Produces the same layout as json.dump({"records": list(records)}, f,
+    indent=indent) without building the list first.
+
+    Args:
+        output_path (str): Path of the JSON file to write
+        records: Any iterable of JSON-serializable records
+        indent (int): Indentation, like json.dump
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    pad = " " * (2 * indent)
+    temp_name = output_path + ".tmp"
+    with open(temp_name, 'w', encoding='utf-8') as f:
+        f.write("{\n" + " " * indent + '"records": [')
+        for record in records:
+            text = json_codec.dumps(record, indent=indent)
+            f.write(("\n" if count == 0 else ",\n") + pad + text.replace("\n", "\n" + pad))
+            count += 1
+        f.write(("\n" + " " * indent + "]" if count else "]") + "\n}")
+    os.replace(temp_name, output_path)
+    return count
+
+
+def merge_json_files_many(input_paths, output_path, max_records_in_memory=MERGE_RUN_SIZE,
+                          temp_dir=None, cache=False):
+    """
+    Merge any number of {"records": [...]} files by "id" (k-way merge).
+
+    When the same id appears more than once, the record from the later file
+    in input_paths wins (and within one file, the later record wins). Memory
+    use is bounded by max_records_in_memory, no matter how big the inputs are.
+
+    Args:
+        input_paths (list): Paths of the JSON files, lowest precedence first
+        output_path (str): Path to save merged JSON (records sorted by id)
+        max_records_in_memory (int): Records sorted in memory per run
+        temp_dir (str): Folder for temporary run files (default: system temp)
+        cache (bool): Read inputs that fit in json_codec's document cache
+                      from it (faster when the same files are merged again,
+                      but the whole inputs then stay in memory)
+
+    Returns:
+        int: Number of records in merged file
+
+    Raises:
+        FileNotFoundError: If an input file does not exist
+        ValueError: If the JSON is malformed or a record has no usable id
+    """
+    with tempfile.TemporaryDirectory(dir=temp_dir) as work_dir:
+        records = _iter_merged_by_id(input_paths, work_dir, max_records_in_memory, cache)
+        return write_records_streaming(output_path, records)
+
+
+def _iter_merged_by_id(input_paths, work_dir, max_records_in_memory=MERGE_RUN_SIZE,
+                       cache=False):
+    """
+    Yield the winning record for each id across input_paths, sorted by id
+    (the external sort-merge described above). Run files go in work_dir.
+    """
+    runs = []
+    batch = []
+    sequence = 0  # Keeps later records after earlier ones with equal ids
+    with json_codec.gc_paused():  # The batch is millions of small objects
+        for precedence, path in enumerate(input_paths):
+            for record in iter_records_cached(path, "records", cache=cache):
+                if not isinstance(record, (dict, json_codec.ReadOnlyDict)) or "id" not in record:
+                    raise ValueError(f"Record without an id in {path}")
+                batch.append([_id_sort_key(record["id"]), precedence, sequence, record])
+                sequence += 1
+                if len(batch) >= max_records_in_memory:
+                    runs.append(_write_run(batch, work_dir, len(runs)))
+                    batch = []
+        batch.sort(key=lambda entry: entry[:3])
+    if not runs:
+        # Everything fit in one batch: no need to spill it to disk
+        yield from _last_per_id(batch)
+        return
+    if batch:
+        runs.append(_write_run(batch, work_dir, len(runs)))
+
+    # Too many runs to open at once: merge them in groups first
+    level = 0
+    while len(runs) > MERGE_FAN_IN:
+        level += 1
+        merged = []
+        for start in range(0, len(runs), MERGE_FAN_IN):
+            group = runs[start:start + MERGE_FAN_IN]
+            path = os.path.join(work_dir, f"level{level}_{start:06d}.jsonl")
+            with open(path, 'w', encoding='utf-8') as f:
+                for entry in _merge_runs(group):
+                    f.write(json_codec.dumps(entry, compact=True) + "\n")
+            for old in group:
+                os.remove(old)
+            merged.append(path)
+        runs = merged
+
+    yield from _last_per_id(_merge_runs(runs))
+
+
+def _last_per_id(entries):
+    """From sorted [id key, precedence, sequence, record] entries, yield
+    the last record of each id."""
+    previous = None
+    for entry in entries:
+        if previous is not None and entry[0] != previous[0]:
+            yield previous[3]
+        previous = entry
+    if previous is not None:
+        yield previous[3]
+
+
+# ==============================================================================
+# DIFF AND PATCH
+# ==============================================================================
+# Incremental sync: instead of shipping a whole merged file, diff two record
+# files and ship only the changes as a patch. Patches follow RFC 6902 (JSON
+# Patch), except that each operation is keyed by record id and its "path" is
+# a JSON Pointer inside that record ("" = the whole record):
+#   {"op": "add", "id": 7, "path": "", "value": {"id": 7, "name": "New"}}
+#   {"op": "replace", "id": 2, "path": "/address/city", "value": "Oslo"}
+#   {"op": "remove", "id": 3, "path": "/nickname"}
+#   {"op": "remove", "id": 5, "path": ""}
+# Patch files are JSON Lines, one operation per line.
+#
+# Both inputs go through the same external sort as merge_json_files_many,
+# then a single merge-join walks them side by side in id order. Records are
+# compared field by field (lists are replaced whole, never aligned), so the
+# diff is O(file size) plus the sort, and memory is bounded by the run size.
+# Applying a patch overwrites only the changed records, in place, whenever
+# they still fit in their old bytes.
+
+def _pointer_escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _pointer_unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same_json(a, b):
+    """
+    Equality that also tells true from 1 and 1.0 from 1, at any depth
+    (== is checked in C first; the text is only compared when it passes).
+    Objects whose keys are in a different order also count as different
+    here; _diff_values then recurses into them and finds no change.
+    """
+    return a == b and json_codec.dumps(a) == json_codec.dumps(b)
+
+
+def _diff_values(old, new, path=""):
+    """Yield patch operations (without "id") that turn old into new."""
+    if _same_json(old, new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                yield {"op": "remove", "path": f"{path}/{_pointer_escape(key)}"}
+        for key, value in new.items():
+            child = f"{path}/{_pointer_escape(key)}"
+            if key not in old:
+                yield {"op": "add", "path": child, "value": value}
+            else:
+                yield from _diff_values(old[key], value, child)
+    else:
+        yield {"op": "replace", "path": path, "value": new}
+
+
+def iter_record_diff(old_path, new_path, max_records_in_memory=MERGE_RUN_SIZE, temp_dir=None,
+                     cache=False):
+    """
+    Yield the id-keyed patch operations that turn old_path into new_path.
+
+    Within one file, the last record with a given id counts (as in
+    merge_json_files_many). Operations come out in id order. cache works
+    as in merge_json_files_many.
+
+    Raises:
+        FileNotFoundError: If an input file does not exist
+        ValueError: If the JSON is malformed or a record has no usable id
+    """
+    with tempfile.TemporaryDirectory(dir=temp_dir) as work_dir:
+        sides = []
+        for name, path in (("old", old_path), ("new", new_path)):
+            side_dir = os.path.join(work_dir, name)
+            os.mkdir(side_dir)
+            sides.append(_iter_merged_by_id([path], side_dir, max_records_in_memory, cache))
+        old_records, new_records = sides
+        old = next(old_records, None)
+        new = next(new_records, None)
+        while old is not None or new is not None:
+            old_key = _id_sort_key(old["id"]) if old is not None else None
+            new_key = _id_sort_key(new["id"]) if new is not None else None
+            if new is None or (old is not None and old_key < new_key):
+                yield {"op": "remove", "id": old["id"], "path": ""}
+                old = next(old_records, None)
+            elif old is None or new_key < old_key:
+                yield {"op": "add", "id": new["id"], "path": "", "value": new}
+                new = next(new_records, None)
+            else:
+                if not _same_json(old, new):
+                    for operation in _diff_values(json_codec.thaw(old), json_codec.thaw(new)):
+                        yield {"op": operation["op"], "id": new["id"], **operation}
+                old = next(old_records, None)
+                new = next(new_records, None)
+
+
+def diff_record_files(old_path, new_path, patch_path, max_records_in_memory=MERGE_RUN_SIZE,
+                      temp_dir=None, cache=False):
+    """
+    Write a patch (JSON Lines) that turns one record file into another.
+
+    Args:
+        old_path (str): The {"records": [...]} file the receiver has
+        new_path (str): The {"records": [...]} file it should end up with
+        patch_path (str): Where to write the patch
+        max_records_in_memory (int): Records sorted in memory per run
+        temp_dir (str): Folder for temporary run files (default: system temp)
+        cache (bool): Read inputs through json_codec's document cache
+
+    Returns:
+        dict: {"added": n, "removed": n, "changed": n, "operations": n}
+              (records added / removed / changed, and total operations)
+
+    Example:
+        >>> diff_record_files("records1.json", "records2.json", "sync.patch.jsonl")
+        {'added': 1, 'removed': 0, 'changed': 1, 'operations': 3}
+    """
+    stats = {"added": 0, "removed": 0, "changed": 0, "operations": 0}
+    last_changed = None  # Ids are never None (see _id_sort_key)
+    temp_name = patch_path + ".tmp"
+    with open(temp_name, 'w', encoding='utf-8') as f:
+        for operation in iter_record_diff(old_path, new_path, max_records_in_memory, temp_dir,
+                                          cache):
+            f.write(json_codec.dumps(operation, compact=True) + "\n")
+            stats["operations"] += 1
+            if operation["path"] == "":
+                stats["added" if operation["op"] == "add" else "removed"] += 1
+            elif operation["id"] != last_changed:
+                last_changed = operation["id"]
+                stats["changed"] += 1
+    os.replace(temp_name, patch_path)
+    return stats
+
+
+def _apply_operation(record, operation):
+    """Apply one in-record operation (path != "") to a record, in place."""
+    *parents, last = [_pointer_unescape(token) for token in operation["path"].split("/")[1:]]
+    target = record
+    for token in parents:
+        if isinstance(target, list):
+            token = int(token)
+        target = target[token]
+    if isinstance(target, list):
+        if operation["op"] == "add":
+            target.insert(len(target) if last == "-" else int(last), operation["value"])
+        elif operation["op"] == "remove":
+            del target[int(last)]
+        else:
+            target[int(last)] = operation["value"]
+    elif operation["op"] == "remove":
+        del target[last]
+    elif operation["op"] == "replace" and last not in target:
+        raise KeyError(last)  # RFC 6902: replace needs an existing member
+    else:
+        target[last] = operation["value"]
+
+
+def _read_patch(patch_path):
+    """Group a patch file's operations by record id: {id key: [operation, ...]}."""
+    operations = {}
+    with open(patch_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                operation = json_codec.loads(line)
+                key = tuple(_id_sort_key(operation["id"]))
+                operations.setdefault(key, []).append(operation)
+    return operations
+
+
+def _patch_record(record, pending):
+    """Apply one record's operations in order; returns None if it was removed."""
+    for operation in pending:
+        if operation["path"] == "":
+            record = operation["value"] if operation["op"] != "remove" else None
+        elif record is None:
+            raise ValueError(f"Patch changes removed record {operation['id']!r}")
+        else:
+            try:
+                _apply_operation(record, operation)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                raise ValueError(f"Patch does not apply to record "
+                                 f"{operation['id']!r} at {operation['path']!r}") from e
+    return record
+
+
+def _added_records(operations):
+    """Records created by the operations left over once the target was read."""
+    added = []
+    for pending in operations.values():
+        if pending[0]["op"] != "add" or pending[0]["path"] != "":
+            raise ValueError(f"Patch refers to missing record {pending[0]['id']!r}")
+        record = _patch_record(pending[0]["value"], pending[1:])
+        if record is not None:
+            added.append(record)
+    return added
+
+
+def _patch_in_place(target_path, operations):
+    """
+    Patch target_path by overwriting only the bytes of the changed records.
+
+    JSON allows whitespace between tokens, so a patched record that is not
+    longer than the old one (written compactly, then padded with spaces)
+    goes in its old place, and a removed record (with its comma) becomes
+    spaces. Added records are written after the last record, followed by
+    the rest of the file. Every operation is checked before the first byte
+    is written.
+
+    Returns:
+        int: Number of records in the patched file, or None (file untouched)
+             if a patched record grew or the records array is empty, in
+             which case the caller rewrites the whole file
+    """
+    edits = []              # (offset, bytes) to overwrite
+    count = 0
+    previous_end = None     # End of the previous array element
+    previous_kept = False
+    trailing_gap = None     # Comma after the last kept record, if only removed ones follow
+    with open(target_path, 'rb') as f:
+        for offset, raw in JsonArrayScanner(f).iter_array("records"):
+            if previous_end is not None:
+                gap = (previous_end, b" " * (offset - previous_end))
+                if previous_kept:
+                    trailing_gap = gap
+                else:
+                    edits.append(gap)  # The comma after a removed record
+            record = json_codec.loads(raw)
+            pending = operations.pop(tuple(_id_sort_key(record["id"])), None)
+            kept = True
+            if pending is not None:
+                record = _patch_record(record, pending)
+                if record is None:
+                    edits.append((offset, b" " * len(raw)))
+                    kept = False
+                else:
+                    data = json_codec.dumps(record, compact=True).encode('utf-8')
+                    if len(data) > len(raw):
+                        return None
+                    edits.append((offset, data.ljust(len(raw))))
+            if kept:
+                count += 1
+                trailing_gap = None
+            previous_end = offset + len(raw)
+            previous_kept = kept
+    added = _added_records(operations)
+    if previous_end is None:
+        return None if added else 0
+    if trailing_gap is not None:
+        edits.append(trailing_gap)
+
+    with open(target_path, 'r+b') as f:
+        for offset, data in edits:
+            f.seek(offset)
+            f.write(data)
+        if added:
+            # Same layout as write_records_streaming, then the rest of the file
+            f.seek(previous_end)
+            rest = f.read()
+            text = "".join(("\n" if count == 0 and i == 0 else ",\n") + "    " +
+                           json_codec.dumps(record, indent=2).replace("\n", "\n    ")
+                           for i, record in enumerate(added))
+            f.seek(previous_end)
+            f.write(text.encode('utf-8') + rest)
+            f.truncate()
+    return count + len(added)
+
+
+def apply_record_patch(target_path, patch_path, cache=False, in_place=True):
+    """
+    Apply a patch written by diff_record_files to a record file.
+
+    The patch (O(changes)) is held in memory. By default only the changed
+    records are written: each one is overwritten where it is (see
+    _patch_in_place), so the cost follows the number of changes, not the
+    file size. If a patched record no longer fits in its old bytes, or with
+    in_place=False, the target is streamed and rewritten through a temporary
+    file that replaces it atomically instead. Either way a patch that does
+    not match leaves the target untouched; only the rewrite also survives a
+    crash halfway through. Patched records keep their position; added
+    records go at the end.
+
+    Args:
+        target_path (str): The {"records": [...]} file to update
+        patch_path (str): Patch file (JSON Lines)
+        cache (bool): Read the target through json_codec's document cache
+                      (rewrite only)
+        in_place (bool): Overwrite changed records in place when possible
+
+    Returns:
+        int: Number of records in the patched file
+
+    Raises:
+        FileNotFoundError: If a file does not exist
+        ValueError: If the patch does not match the target (e.g. it removes
+                    a record or field that is not there)
+    """
+    if in_place:
+        count = _patch_in_place(target_path, _read_patch(patch_path))
+        if count is not None:
+            return count
+    operations = _read_patch(patch_path)
+
+    def patched_records():
+        for record in iter_records_cached(target_path, "records", cache=cache):
+            pending = operations.pop(tuple(_id_sort_key(record["id"])), None)
+            if pending is None:
+                yield record
+                continue
+            # Cached records are read-only
+            record = _patch_record(json_codec.thaw(record), pending)
+            if record is not None:
+                yield record
+        # Whatever is left must create new records
+        yield from _added_records(operations)
+
+    try:
+        return write_records_streaming(target_path, patched_records())
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(target_path + ".tmp")
+        raise
+
+
+# ==============================================================================
+# PARALLEL MAP
+# ==============================================================================
+def map_in_order(function, tasks, workers):
+    """
+    Like map(), but across a process pool, keeping at most 2 tasks per
+    worker in flight so memory stays bounded. Results come back in order.
+
+    function must be a top-level function of an importable module (such as
+    csv_convert._parse_csv_chunk), so the worker processes can find it.
+    """
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = collections.deque()
+        for task in tasks:
+            in_flight.append(pool.submit(function, task))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
@@ -0,0 +1,416 @@
+"""
+Record Search - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Searching a {"records": [...]} file by field values (Problem 8 in
+04_JSON_Practice_Problems.py):
+
+    import record_search
+
+    for match in record_search.iter_search_records("records.json",
+                                                   department="HR",
+                                                   salary__gt=60000):
+        print(match["name"])
+
+Criteria can compare with operators (QUERY OPERATORS). A file is streamed
+record by record, unless a field has a sidecar index (FIELD INDEXES): then
+only the records the index points at are read, and a tiny query planner
+picks the most selective index (QUERY PLANNER). explain_search() shows
+which plan a search would use.
+"""
+
+import bisect
+import json
+import os
+import re
+
+import json_codec  # Picks the fastest installed JSON library (see json_codec.py)
+import record_files  # Streaming reads of record files (see record_files.py)
+
+SEARCH_DOCUMENT_CACHE = False  # True: keep scanned files parsed in memory between searches
+
+
+# ==============================================================================
+# QUERY OPERATORS
+# ==============================================================================
+# A criterion may end in __<operator>, Django style:
+#   salary__gt=70000, age__between=(25, 30), major__in=["CS", "Math"],
+#   courses__contains="COMP3083". A plain name (major="CS") means equality.
+
+def _op_contains(actual, expected):
+    return isinstance(actual, (list, str, json_codec.ReadOnlyList)) and expected in actual
+
+
+_OPERATORS = {
+    "eq": lambda actual, expected: actual == expected,
+    "ne": lambda actual, expected: actual != expected,
+    "gt": lambda actual, expected: actual > expected,
+    "gte": lambda actual, expected: actual >= expected,
+    "lt": lambda actual, expected: actual < expected,
+    "lte": lambda actual, expected: actual <= expected,
+    "between": lambda actual, expected: expected[0] <= actual <= expected[1],
+    "in": lambda actual, expected: actual in expected,
+    "contains": _op_contains,
+}
+
+
+def _parse_criteria(search_criteria):
+    """
+    Split keyword criteria into (field, operator, value) predicates.
+
+    "salary__gt" -> ("salary", "gt", value). Names without a known
+    operator suffix are treated as equality on the whole name.
+    """
+    predicates = []
+    for name, value in search_criteria.items():
+        field, _, operator = name.rpartition("__")
+        if not field or operator not in _OPERATORS:
+            field, operator = name, "eq"
+        if operator == "between" and not (isinstance(value, (list, tuple)) and len(value) == 2):
+            raise ValueError(f"{name} needs a (low, high) pair")
+        # "x" in "abc" is a substring test, and the index would split the
+        # string into characters, so __in takes a real collection only
+        if operator == "in" and not isinstance(
+                value, (list, tuple, set, frozenset, json_codec.ReadOnlyList)):
+            raise ValueError(f"{name} needs a list, tuple or set of values")
+        predicates.append((field, operator, value))
+    return predicates
+
+
+def _record_matches(record, predicates):
+    """Return True if the record satisfies every (field, operator, value)."""
+    for field, operator, value in predicates:
+        if field not in record:
+            return False
+        try:
+            if not _OPERATORS[operator](record[field], value):
+                return False
+        except TypeError:
+            return False  # e.g. comparing a string with a number
+    return True
+
+
+# ==============================================================================
+# FIELD INDEXES
+# ==============================================================================
+# A sidecar file per (data file, field) maps each value to the byte offsets
+# of the records holding it. Repeated lookups then read only the matching
+# records instead of scanning the whole file.
+
+_FIELD_INDEX_CACHE = {}
+
+
+def _index_path(json_file_path, field):
+    """Sidecar file name, e.g. records.json -> records.json.department.idx.json"""
+    safe_field = re.sub(r'[^\w.-]', '_', field)
+    return f"{json_file_path}.{safe_field}.idx.json"
+
+
+# Bump when _index_key changes so sidecars built by older code get rebuilt
+_INDEX_FORMAT = 2
+
+
+def _key_value(value):
+    """
+    Normalize a JSON value so that values equal under == look the same.
+
+    A scan compares with ==, where True == 1 == 1.0 and [True] == [1], so
+    bools become ints and whole floats become ints, also inside lists and
+    objects. The index then finds exactly the records a scan would.
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, json_codec.ReadOnlyList)):
+        return [_key_value(item) for item in value]
+    if isinstance(value, (dict, json_codec.ReadOnlyDict)):
+        return {key: _key_value(item) for key, item in value.items()}
+    return value
+
+
+def _index_key(value):
+    """Turn any JSON value into a string key (True, 1 and 1.0 share a key, like ==)."""
+    return json.dumps(_key_value(value), sort_keys=True)
+
+
+def _file_signature(json_file_path):
+    """Size and modification time; if either changes the index is stale."""
+    stat = os.stat(json_file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def build_field_index(json_file_path, field):
+    """
+    Build (or rebuild) the sidecar index for one field of a records file.
+
+    The index is saved next to the data file as JSON:
+    {
+      "format": 2,
+      "field": "department",
+      "source": {"size": 1234, "mtime_ns": 1700000000000000000},
+      "values": {"\"HR\"": [[offset, length], ...], ...},
+      "elements": {...}
+    }
+    "elements" indexes the items of list fields (for __contains) and
+    "has_strings" notes string values (substring __contains needs a scan).
+
+    Args:
+        json_file_path (str): Path to JSON records file
+        field (str): Record field to index
+
+    Returns:
+        dict: The index ("values" and "elements" map value key -> locations)
+
+    Raises:
+        FileNotFoundError: If the data file does not exist
+        ValueError: If the JSON is malformed
+    """
+    signature = _file_signature(json_file_path)
+    values = {}
+    elements = {}
+    has_strings = False
+    with open(json_file_path, 'rb') as f:
+        for offset, raw in record_files.JsonArrayScanner(f).iter_array("records"):
+            record = json_codec.loads(raw)
+            if not isinstance(record, dict) or field not in record:
+                continue
+            location = [offset, len(raw)]
+            values.setdefault(_index_key(record[field]), []).append(location)
+            if isinstance(record[field], str):
+                has_strings = True
+            elif isinstance(record[field], list):
+                for key in {_index_key(item) for item in record[field]}:
+                    elements.setdefault(key, []).append(location)
+
+    index = {"format": _INDEX_FORMAT, "field": field, "source": signature,
+             "values": values, "elements": elements, "has_strings": has_strings}
+    sidecar = _index_path(json_file_path, field)
+    try:
+        # Write to a temporary file first so readers never see half an index
+        with open(sidecar + ".tmp", 'wb') as f:
+            json_codec.dump(index, f)
+        os.replace(sidecar + ".tmp", sidecar)
+    except OSError:
+        pass  # Read-only folder: the index still works for this process
+
+    _FIELD_INDEX_CACHE[(os.path.abspath(json_file_path), field)] = (signature, index)
+    return index
+
+
+def load_field_index(json_file_path, field):
+    """
+    Return the index for a field if one has been built, rebuilding it when
+    the data file's size or mtime changed since. Returns None if the field
+    has never been indexed.
+    """
+    signature = _file_signature(json_file_path)
+    cache_key = (os.path.abspath(json_file_path), field)
+    cached = _FIELD_INDEX_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    sidecar = _index_path(json_file_path, field)
+    try:
+        with open(sidecar, 'rb') as f:
+            index = json_codec.load(f)
+    except FileNotFoundError:
+        return None if cached is None else build_field_index(json_file_path, field)
+    except (OSError, ValueError):
+        return build_field_index(json_file_path, field)
+
+    if (index.get("source") != signature or index.get("field") != field
+            or index.get("format") != _INDEX_FORMAT):
+        return build_field_index(json_file_path, field)
+    _FIELD_INDEX_CACHE[cache_key] = (signature, index)
+    return index
+
+
+def _sorted_numeric_index(index):
+    """
+    Numeric keys of an index in ascending order, for range operators.
+
+    Returns (keys, postings, prefix) where prefix[i] is the number of records
+    stored before keys[i], so a range count is prefix[hi] - prefix[lo].
+    Built once per loaded index and kept in memory alongside it.
+    """
+    if "_sorted" in index:
+        return index["_sorted"]
+
+    numeric = []
+    for key, locations in index["values"].items():
+        value = json.loads(key)
+        if record_files.is_number(value):
+            numeric.append((value, locations))
+    numeric.sort(key=lambda pair: pair[0])
+
+    keys = [value for value, _ in numeric]
+    postings = [locations for _, locations in numeric]
+    prefix = [0]
+    for locations in postings:
+        prefix.append(prefix[-1] + len(locations))
+
+    index["_sorted"] = (keys, postings, prefix)
+    return index["_sorted"]
+
+
+def _index_lookup(index, operator, value):
+    """
+    Use an index to answer one predicate.
+
+    Returns (estimated_rows, postings) where postings is a list of location
+    lists, or None if the index cannot answer this operator/value.
+    """
+    if operator == "eq":
+        locations = index["values"].get(_index_key(value), [])
+        return len(locations), [locations]
+
+    if operator == "in":
+        keys = {_index_key(item) for item in value}
+        postings = [index["values"][key] for key in keys if key in index["values"]]
+        return sum(len(locations) for locations in postings), postings
+
+    if operator == "contains":
+        if isinstance(value, str) and index.get("has_strings", True):
+            return None  # Substring search cannot use the index
+        locations = index["elements"].get(_index_key(value), [])
+        return len(locations), [locations]
+
+    if operator in ("gt", "gte", "lt", "lte", "between"):
+        bounds = value if operator == "between" else [value]
+        if not all(record_files.is_number(bound) for bound in bounds):
+            return None
+        keys, postings, prefix = _sorted_numeric_index(index)
+        lo, hi = 0, len(keys)
+        if operator == "gt":
+            lo = bisect.bisect_right(keys, value)
+        elif operator == "gte":
+            lo = bisect.bisect_left(keys, value)
+        elif operator == "lt":
+            hi = bisect.bisect_left(keys, value)
+        elif operator == "lte":
+            hi = bisect.bisect_right(keys, value)
+        else:
+            lo = bisect.bisect_left(keys, value[0])
+            hi = max(lo, bisect.bisect_right(keys, value[1]))
+        return prefix[hi] - prefix[lo], postings[lo:hi]
+
+    return None  # "ne" would match almost everything: scan instead
+
+
+# ==============================================================================
+# QUERY PLANNER
+# ==============================================================================
+def _plan_search(json_file_path, predicates, names):
+    """
+    Choose how a search will run (a tiny query planner).
+
+    Every predicate whose field has an index is costed by the number of
+    records the index says it matches, and the most selective one drives
+    the search. Returns (plan, postings); postings is None for a scan.
+    """
+    plan = {"strategy": "scan", "driver": None, "estimated_rows": None,
+            "considered": {}, "unindexed": []}
+    best_postings = None
+
+    for name, (field, operator, value) in zip(names, predicates):
+        index = load_field_index(json_file_path, field)
+        result = None if index is None else _index_lookup(index, operator, value)
+        if result is None:
+            plan["unindexed"].append(name)
+            continue
+        rows, postings = result
+        plan["considered"][name] = rows
+        if plan["estimated_rows"] is None or rows < plan["estimated_rows"]:
+            plan.update(strategy="index", driver=name, estimated_rows=rows)
+            best_postings = postings
+
+    return plan, best_postings
+
+
+def explain_search(json_file_path, **search_criteria):
+    """
+    Report the plan search_records would use, without running the search.
+
+    The most selective indexed predicate picks which records are read; all
+    predicates are then re-checked on those records. Without any usable
+    index the whole file is scanned. Use this to decide which fields are
+    worth indexing with build_field_index.
+
+    Args:
+        json_file_path (str): Path to JSON records file
+        **search_criteria: Same criteria as search_records
+
+    Returns:
+        dict: The plan, e.g.
+        {
+          "strategy": "index",            # or "scan"
+          "driver": "salary__gt",         # predicate answered by an index
+          "estimated_rows": 12,           # records that will be read
+          "considered": {"salary__gt": 12, "department": 40},
+          "unindexed": ["name"]           # predicates without an index
+        }
+
+    Example:
+        >>> explain_search("records.json", department="HR", salary__gt=60000)
+    """
+    predicates = _parse_criteria(search_criteria)
+    plan, _ = _plan_search(json_file_path, predicates, list(search_criteria))
+    return plan
+
+
+def _read_records_at(json_file_path, locations):
+    """Yield the records stored at the given [offset, length] locations."""
+    with open(json_file_path, 'rb') as f:
+        for offset, length in locations:
+            f.seek(offset)
+            yield json_codec.loads(f.read(length))
+
+
+def _merge_postings(postings):
+    """Combine several location lists into one list in file order, no repeats."""
+    if len(postings) == 1:
+        return postings[0]
+    unique = {location[0]: location for locations in postings for location in locations}
+    return [unique[offset] for offset in sorted(unique)]
+
+
+def iter_search_records(json_file_path, **search_criteria):
+    """
+    Stream the records that match ALL criteria (generator version of
+    search_records). Matches are yielded as soon as they are parsed.
+
+    Criteria may use operators (salary__gt=70000, major__in=[...], ...).
+    If any criteria field has an index (see build_field_index), the most
+    selective one picks the records to read; otherwise the file is streamed
+    (or read from json_codec's document cache if SEARCH_DOCUMENT_CACHE is
+    True and the file fits in it).
+
+    Args:
+        json_file_path (str): Path to JSON file
+        **search_criteria: Field=value pairs every match must satisfy
+
+    Yields:
+        dict: Matching records, in file order
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the JSON is malformed, or a __between/__in value
+                    has the wrong shape
+
+    Example:
+        >>> for match in iter_search_records("records.json", department="HR"):
+        ...     print(match["name"])
+    """
+    predicates = _parse_criteria(search_criteria)
+    _, postings = _plan_search(json_file_path, predicates, list(search_criteria))
+    if postings is not None:
+        # Indexed path: read only the candidate records, O(matches)
+        records = _read_records_at(json_file_path, _merge_postings(postings))
+    else:
+        records = record_files.iter_records_cached(json_file_path, "records",
+                                                   cache=SEARCH_DOCUMENT_CACHE)
+
+    for record in records:
+        if isinstance(record, (dict, json_codec.ReadOnlyDict)) and _record_matches(record, predicates):
+            yield json_codec.thaw(record)
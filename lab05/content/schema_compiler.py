@@ -0,0 +1,146 @@
+"""
+Schema Compiler - Lab 05 helper module
+Introduction to Programming and Computer Science I
+
+Validating many records against the same schema. The schema format is
+the one validate_json_schema() checks (Problem 10 in
+04_JSON_Practice_Problems.py):
+
+    import schema_compiler
+
+    validate = schema_compiler.compile_schema({"age": {"type": "number", "min": 0}})
+    validate({"age": -1})               # (False, ["Field 'age' must be >= 0"])
+    validate.validate_many(records)     # (valid_count, [(index, error), ...])
+"""
+
+
+# ==============================================================================
+# SCHEMA TYPES
+# ==============================================================================
+SCHEMA_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+}
+
+
+def type_matches(value, type_name):
+    """True if value has the schema type type_name ("string", "number", ...)."""
+    # bool is a subclass of int in Python, but true is not a JSON number
+    if type_name == "number" and isinstance(value, bool):
+        return False
+    return isinstance(value, SCHEMA_TYPES[type_name])
+
+
+# ==============================================================================
+# COMPILED SCHEMAS
+# ==============================================================================
+# validate_json_schema looks up "type", "required", "min" and "max" in the
+# schema again for every record. compile_schema does that work once and
+# builds one small check function per field, so validating a record only
+# runs the checks that actually apply to it.
+
+def _compile_field_check(field, rules):
+    """Return check(data) -> error message or None, specialized for one field."""
+    required = rules.get("required", False)
+    type_name = rules.get("type")
+    if type_name is not None and type_name not in SCHEMA_TYPES:
+        raise ValueError(f"Field '{field}' has unknown type '{type_name}' in schema")
+    types = SCHEMA_TYPES.get(type_name)
+    reject_bool = type_name == "number"
+    low = rules.get("min") if type_name == "number" else None
+    high = rules.get("max") if type_name == "number" else None
+    missing_error = f"Missing required field: {field}"
+    low_error = f"Field '{field}' must be >= {low}"
+    high_error = f"Field '{field}' must be <= {high}"
+
+    def check(data):
+        if field not in data:
+            return missing_error if required else None
+        value = data[field]
+        if types is not None and (not isinstance(value, types)
+                                  or (reject_bool and value.__class__ is bool)):
+            return f"Field '{field}' should be {type_name}, got {type(value).__name__}"
+        if low is not None and value < low:
+            return low_error
+        if high is not None and value > high:
+            return high_error
+        return None
+
+    return check
+
+
+class CompiledSchema:
+    """
+    A schema turned into ready-to-run checks (see compile_schema).
+
+    Calling it returns (is_valid, errors) like validate_json_schema, but
+    stops at the first error, so errors holds at most one message.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._checks = [_compile_field_check(field, rules) for field, rules in schema.items()]
+
+    def __call__(self, data):
+        for check in self._checks:
+            error = check(data)
+            if error is not None:
+                return False, [error]
+        return True, []
+
+    def is_valid(self, data):
+        """Fast yes/no answer without building an errors list."""
+        for check in self._checks:
+            if check(data) is not None:
+                return False
+        return True
+
+    def validate_many(self, records):
+        """
+        Validate a batch of records.
+
+        Args:
+            records: Iterable of dicts
+
+        Returns:
+            tuple: (valid_count, failures) where failures is a list of
+                   (record_index, first_error_message)
+        """
+        checks = self._checks
+        valid_count = 0
+        failures = []
+        for index, record in enumerate(records):
+            for check in checks:
+                error = check(record)
+                if error is not None:
+                    failures.append((index, error))
+                    break
+            else:
+                valid_count += 1
+        return valid_count, failures
+
+
+def compile_schema(schema):
+    """
+    Compile a schema (same format as validate_json_schema) once for reuse.
+
+    Args:
+        schema (dict): Schema definition
+
+    Returns:
+        CompiledSchema: Callable validator with is_valid() and validate_many()
+
+    Raises:
+        ValueError: If the schema uses an unknown type
+
+    Example:
+        >>> validate = compile_schema({"age": {"type": "number", "min": 0}})
+        >>> validate({"age": -1})
+        (False, ["Field 'age' must be >= 0"])
+        >>> validate.validate_many([{"age": 5}, {"age": "five"}])
+        (1, [(1, "Field 'age' should be number, got str")])
+    """
+    return CompiledSchema(schema)
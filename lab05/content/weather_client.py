@@ -0,0 +1,396 @@
+"""
+Weather Client - shared HTTP client for the weather checkers
+Introduction to Programming and Computer Science I
+
+Both weather checkers (lab03/content/examples/weather_checker.py and
+lab05/content/06_weather_checker.py) talk to OpenWeatherMap through this
+module instead of calling requests.get() directly:
+
+    import weather_client
+
+    response = weather_client.default_client().fetch("Miami", api_key)
+    if response.status_code == 200:
+        print(response.data["main"]["temp"])
+
+Why not just requests.get()?
+- requests.get() opens a new connection (TCP + DNS, and TLS for https) for
+  every call. A Session keeps connections open (keep-alive) in a pool and
+  reuses them, which makes repeated queries noticeably faster.
+- Every request has a timeout (connect, read), so a dead server can never
+  hang the program.
+- "Too many requests" (429) and server errors (5xx) are usually temporary.
+  They are retried with exponential backoff plus random jitter, so many
+  clients retrying at once do not all hit the server at the same moment.
+  Network errors (timeouts, refused connections) are retried the same way.
+
+What a status code MEANS (404 = city not found, 401 = bad key, ...) is
+still decided by each checker; this module only delivers the response.
+
+TokenBucket keeps a batch of requests under an API's requests-per-minute
+budget (pass one to fetch() as limiter=). SingleFlight makes callers that
+ask for the same thing at the same time share one request.
+
+For offline testing, StubWeatherServer serves canned answers on localhost;
+point a client at it with base_url=server.url.
+"""
+
+import asyncio
+import collections
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+WEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather"
+POOL_SIZE = 10             # Keep-alive connections kept per host
+CONNECT_TIMEOUT = 3.05     # Seconds to establish a connection
+READ_TIMEOUT = 5           # Seconds to wait for the answer
+MAX_RETRIES = 3            # Extra attempts after the first one
+BACKOFF_BASE = 0.5         # First retry waits up to this many seconds
+BACKOFF_MAX = 8.0          # No single wait is longer than this
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Thread-safe rate limiter: at most `rate` requests in any window of
+    `per` seconds, of which up to `burst` may go out at once.
+
+    Tokens refill continuously at rate / per, so a steady stream of
+    requests gets the full `rate`. Each request takes one token, and the
+    bucket holds at most `burst` of them. The times of the last `rate`
+    requests are kept as well, so a burst on top of a full window cannot
+    push any `per`-second window over `rate`. acquire() waits (without
+    holding the lock) until both allow another request.
+
+    Example:
+        >>> limiter = TokenBucket(100, burst=10)  # 100 requests per minute
+        >>> limiter.acquire()
+    """
+
+    def __init__(self, rate, per=60.0, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.per = per
+        self.capacity = max(1, min(burst, rate))
+        self.fill_rate = rate / per  # Tokens per second
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.sent = collections.deque()  # Times of the requests in the last `per` seconds
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting as long as necessary."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                while self.sent and self.sent[0] <= now - self.per:
+                    self.sent.popleft()
+                if self.tokens >= 1 and len(self.sent) < self.rate:
+                    self.tokens -= 1
+                    self.sent.append(now)
+                    return
+                wait = max((1 - self.tokens) / self.fill_rate,
+                           self.sent[0] + self.per - now if len(self.sent) >= self.rate else 0)
+            time.sleep(wait)
+
+
+class SingleFlight:
+    """
+    Request coalescing: while a call for a key is in flight, later callers
+    for the same key wait for its result instead of starting their own.
+
+    Works for threads (do) and asyncio tasks (do_async), even mixed: both
+    wait on the same concurrent.futures.Future. An exception reaches every
+    waiter, and nothing is remembered once a call finishes, so the next
+    caller tries again (caching answers is the caller's job).
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> flights.do(("miami", "metric"), lambda: client.fetch("Miami", api_key))
+    """
+
+    def __init__(self):
+        self.in_flight = {}  # key -> Future of the running call
+        self.lock = threading.Lock()
+        self.calls = 0       # Calls that did the work
+        self.coalesced = 0   # Calls that waited for someone else's
+
+    def _join(self, key):
+        """Return (future, is_leader) for key."""
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            future.set_running_or_notify_cancel()  # A waiter cannot cancel it
+            self.in_flight[key] = future
+            self.calls += 1
+            return future, True
+
+    def _lead(self, key, future, fn):
+        """Run fn and hand its result (or exception) to every waiter."""
+        try:
+            result = fn()
+        except BaseException as e:
+            with self.lock:
+                del self.in_flight[key]
+            future.set_exception(e)
+        else:
+            with self.lock:
+                del self.in_flight[key]
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """Return fn()'s result, sharing one call among concurrent callers."""
+        future, leader = self._join(key)
+        if leader:
+            self._lead(key, future, fn)
+        return future.result()
+
+    async def do_async(self, key, fn):
+        """Like do(), for asyncio; a blocking fn runs in the default executor."""
+        future, leader = self._join(key)
+        if leader:
+            asyncio.get_running_loop().run_in_executor(None, self._lead, key, future, fn)
+        return await asyncio.wrap_future(future)
+
+
+class WeatherResponse:
+    """Status code, parsed JSON (200 only), time taken and attempts made."""
+
+    __slots__ = ("status_code", "data", "elapsed", "attempts")
+
+    def __init__(self, status_code, data, elapsed, attempts):
+        self.status_code = status_code
+        self.data = data
+        self.elapsed = elapsed
+        self.attempts = attempts
+
+    def __repr__(self):
+        return (f"WeatherResponse(status_code={self.status_code}, "
+                f"attempts={self.attempts}, elapsed={self.elapsed:.3f})")
+
+
+class WeatherClient:
+    """
+    Pooled, retrying client for the current-weather endpoint.
+
+    Args:
+        base_url (str): Endpoint URL (default: WEATHER_API_URL, or the
+                        WEATHER_API_URL environment variable if set)
+        pool_size (int): Keep-alive connections kept open per host
+        connect_timeout (float): Seconds to establish a connection
+        read_timeout (float): Seconds to wait for a response
+        max_retries (int): Retries on 429/5xx and network errors
+        backoff_base (float): Upper bound of the first retry's wait
+        backoff_max (float): Upper bound of any single wait
+
+    Example:
+        >>> with WeatherClient(max_retries=1) as client:
+        ...     response = client.fetch("London", api_key)
+    """
+
+    def __init__(self, base_url=None, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.base_url = base_url or os.getenv("WEATHER_API_URL") or WEATHER_API_URL
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        self.pool_size = 0
+        self.resize_pool(pool_size)
+
+    def resize_pool(self, pool_size):
+        """Keep up to pool_size connections per host (grow only)."""
+        if pool_size > self.pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self.pool_size = pool_size
+
+    def _backoff(self, attempt, response=None):
+        """Seconds to wait before retry number attempt (1, 2, ...)."""
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():  # The server told us how long to wait
+                return min(float(retry_after), self.backoff_max)
+        # "Full jitter": a random wait between 0 and the exponential bound
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def fetch(self, city, api_key, units="metric", limiter=None):
+        """
+        Get the current weather for a city.
+
+        Args:
+            city (str): City name
+            api_key (str): OpenWeatherMap API key
+            units (str): "metric", "imperial" or "standard"
+            limiter (TokenBucket): Rate limit every attempt (retries too)
+
+        Returns:
+            WeatherResponse: The final response (after any retries). data
+                             is the parsed JSON for status 200, else None.
+
+        Raises:
+            requests.RequestException: If the network keeps failing
+                                       (requests.Timeout, ConnectionError)
+            ValueError: If a 200 response is not valid JSON
+        """
+        params = {"q": city, "appid": api_key, "units": units}
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt > self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            if response.status_code in RETRY_STATUSES and attempt <= self.max_retries:
+                response.close()
+                time.sleep(self._backoff(attempt, response))
+                continue
+            data = response.json() if response.status_code == 200 else None
+            return WeatherResponse(response.status_code, data, time.perf_counter() - start,
+                                   attempt)
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """The process-wide shared client (created on first use)."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = WeatherClient()
+        return _default_client
+
+
+def set_default_client(client):
+    """Replace the shared client (e.g. with one pointed at a stub server)."""
+    global _default_client
+    with _default_lock:
+        previous, _default_client = _default_client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+# ==============================================================================
+# STUB SERVER (offline testing)
+# ==============================================================================
+class StubWeatherServer:
+    """
+    A tiny local stand-in for the weather API.
+
+    Known cities get a canned 200 answer, anything else 404, a wrong key
+    401. script can queue status codes to return first (e.g. [503, 429]
+    to test retries). The server speaks HTTP/1.1 keep-alive, and counts
+    requests and new connections so pooling can be observed.
+
+    Example:
+        >>> with StubWeatherServer({"miami": {"name": "Miami", "main": {"temp": 28}}}) as server:
+        ...     client = WeatherClient(base_url=server.url)
+        ...     client.fetch("Miami", server.api_key).data["name"]
+        'Miami'
+    """
+
+    def __init__(self, cities=None, api_key="test-key", script=(), latency=0.0):
+        self.cities = {name.casefold(): data for name, data in (cities or {}).items()}
+        self.api_key = api_key
+        self.script = list(script)
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/data/2.5/weather"
+        self.thread = None
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections open between requests
+            disable_nagle_algorithm = True  # Send small answers without delay
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                with stub.lock:
+                    stub.requests += 1
+                    scripted = stub.script.pop(0) if stub.script else None
+                if stub.latency:
+                    time.sleep(stub.latency)
+                city = query.get("q", [""])[0]
+                if scripted is not None:
+                    status, body = scripted, {"cod": scripted, "message": "scripted"}
+                elif query.get("appid", [""])[0] != stub.api_key:
+                    status, body = 401, {"cod": 401, "message": "Invalid API key"}
+                elif city.casefold() in stub.cities:
+                    status, body = 200, stub.cities[city.casefold()]
+                else:
+                    status, body = 404, {"cod": "404", "message": "city not found"}
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass  # Keep test output quiet
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()